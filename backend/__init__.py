@@ -0,0 +1,17 @@
+"""
+Recruitr backend package.
+
+The application itself runs from inside this directory (uvicorn main:app),
+so internal modules import each other by their top-level names (config,
+database, services, ...). Making this a package lets auxiliary scripts run
+as modules (e.g. python -m backend.data.generate_participants) from the
+repository root; registering the backend directory on sys.path here keeps
+a single import context so config/database are only initialized once.
+"""
+
+import os
+import sys
+
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if _BACKEND_DIR not in sys.path:
+    sys.path.insert(0, _BACKEND_DIR)
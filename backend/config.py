@@ -3,12 +3,19 @@ Configuration management for Recruitr backend.
 Loads environment variables and provides application settings.
 """
 
-from pydantic_settings import BaseSettings
+from functools import cached_property, lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=False,
+        extra="ignore"
+    )
     
     # Application
     app_name: str = "Recruitr"
@@ -35,21 +42,32 @@ class Settings(BaseSettings):
     
     # Sentence-BERT Model
     sbert_model: str = "all-MiniLM-L6-v2"
+
+    # Participant snapshot cache (set False to force a full reload on boot)
+    participants_snapshot: bool = True
     
     # Security
     jwt_secret: Optional[str] = None
     cors_origins: str = "http://localhost:5173,http://localhost:3000,http://localhost:3001,http://localhost:3002"
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
-    
-    @property
-    def cors_origins_list(self) -> list[str]:
-        """Parse CORS origins from comma-separated string."""
-        return [origin.strip() for origin in self.cors_origins.split(",")]
+    @cached_property
+    def cors_origins_list(self) -> tuple[str, ...]:
+        """Parse CORS origins from the comma-separated string, computed once."""
+        return tuple(origin.strip() for origin in self.cors_origins.split(","))
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the cached Settings instance.
+
+    The .env file is read and validated only on the first call; subsequent
+    calls (including FastAPI Depends(get_settings) usage) return the same
+    instance. Usable as a dependency for per-route overrides in tests.
+    """
+    return Settings()
 
 
-# Global settings instance
-settings = Settings()
+# Global settings instance (resolved once via the cache)
+settings = get_settings()
 
@@ -1,19 +1,17 @@
 """
 Generate synthetic participant data WITHOUT embeddings (quick version).
 We'll add embeddings later when implementing SBERT.
+
+Run from the repository root as:
+    python -m backend.data.generate_simple
 """
 
 import json
 import random
 from typing import List, Dict
 import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database import supabase
-from config import settings
 
 
 # Sample data for generation
@@ -1,6 +1,16 @@
 """Database package."""
 
-from .supabase_client import supabase, get_supabase, get_supabase_client
+from .supabase_client import (
+    supabase,
+    get_supabase,
+    get_supabase_client,
+    get_async_supabase,
+)
 
-__all__ = ["supabase", "get_supabase", "get_supabase_client"]
+__all__ = [
+    "supabase",
+    "get_supabase",
+    "get_supabase_client",
+    "get_async_supabase",
+]
 
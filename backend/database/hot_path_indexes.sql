@@ -0,0 +1,18 @@
+-- Composite Indexes for Hot Researcher Endpoints
+-- Each index matches an .eq(user/researcher id) + .order(created_at)
+-- access pattern so Postgres can do a single index scan instead of a
+-- bitmap-heap scan. The search_history keyset index lives in
+-- search_history_keyset_index.sql; saved_participants already has a
+-- UNIQUE(researcher_id, participant_id) constraint in schema.sql.
+
+-- Run this in Supabase SQL Editor
+-- (on a live production database, prefer CREATE INDEX CONCURRENTLY
+-- outside a transaction to avoid blocking writes)
+
+-- GET /notifications: filter by user + unread, newest first
+CREATE INDEX IF NOT EXISTS idx_notifications_user_read_created
+    ON public.notifications(user_id, read, created_at DESC);
+
+-- GET /drafts: filter by user, newest first
+CREATE INDEX IF NOT EXISTS idx_outreach_drafts_user_created
+    ON outreach_drafts(user_id, created_at DESC);
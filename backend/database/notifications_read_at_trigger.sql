@@ -0,0 +1,20 @@
+-- Notification read_at Trigger
+-- Stamps read_at in the database when a notification flips to read,
+-- so the API no longer computes and ships a Python-side timestamp.
+
+-- Run this in Supabase SQL Editor
+
+CREATE OR REPLACE FUNCTION set_notification_read_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.read AND NOT OLD.read THEN
+        NEW.read_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER set_notifications_read_at
+    BEFORE UPDATE ON public.notifications
+    FOR EACH ROW
+    EXECUTE FUNCTION set_notification_read_at();
@@ -0,0 +1,8 @@
+-- Keyset Pagination Index for Search History
+-- Supports the cursor branch of GET /api/researcher/searches, which
+-- seeks on (user_id, created_at DESC, id DESC) instead of OFFSET.
+
+-- Run this in Supabase SQL Editor
+
+CREATE INDEX IF NOT EXISTS idx_search_history_user_created_id
+    ON public.search_history(user_id, created_at DESC, id DESC);
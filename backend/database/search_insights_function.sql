@@ -0,0 +1,73 @@
+-- Search Insights Aggregate Function
+-- Moves the Python-side analytics aggregation (daily activity, most
+-- active weekday, average matches, role/tool keyword counters) from
+-- /api/researcher/analytics into Postgres. One round-trip replaces
+-- downloading 100 history rows and iterating them per request.
+
+-- Run this in Supabase SQL Editor
+
+CREATE OR REPLACE FUNCTION search_insights(uid UUID)
+RETURNS JSONB AS $$
+WITH history AS (
+    SELECT created_at, results_count, lower(query_text) AS query_lower
+    FROM search_history
+    WHERE user_id = uid
+),
+days AS (
+    SELECT to_char(date_trunc('day', created_at), 'YYYY-MM-DD') AS day,
+           count(*) AS cnt
+    FROM history
+    WHERE created_at >= now() - interval '30 days'
+    GROUP BY 1
+),
+dow AS (
+    SELECT trim(to_char(created_at, 'Day')) AS day_name, count(*) AS cnt
+    FROM history
+    GROUP BY 1
+    ORDER BY cnt DESC
+    LIMIT 1
+),
+roles AS (
+    SELECT k.keyword, count(*) AS cnt
+    FROM history h
+    JOIN unnest(ARRAY[
+        'product manager', 'designer', 'developer', 'engineer', 'manager',
+        'analyst', 'researcher', 'marketer', 'sales', 'recruiter'
+    ]) AS k(keyword) ON h.query_lower LIKE '%' || k.keyword || '%'
+    GROUP BY 1
+    ORDER BY cnt DESC
+    LIMIT 1
+),
+tools AS (
+    SELECT k.keyword, count(*) AS cnt
+    FROM history h
+    JOIN unnest(ARRAY[
+        'figma', 'sketch', 'adobe', 'notion', 'jira', 'slack',
+        'trello', 'asana', 'miro', 'invision'
+    ]) AS k(keyword) ON h.query_lower LIKE '%' || k.keyword || '%'
+    GROUP BY 1
+    ORDER BY cnt DESC
+    LIMIT 1
+)
+SELECT jsonb_build_object(
+    'activity_by_day',
+        COALESCE((SELECT jsonb_object_agg(day, cnt ORDER BY day) FROM days),
+                 '{}'::jsonb),
+    'most_active_day',
+        COALESCE((SELECT day_name FROM dow), 'N/A'),
+    'avg_matches_per_search',
+        COALESCE((SELECT round(avg(results_count)::numeric, 1) FROM history), 0),
+    'most_searched_role',
+        COALESCE((SELECT initcap(keyword) FROM roles), 'N/A'),
+    'most_used_tool_filter',
+        COALESCE((SELECT initcap(keyword) FROM tools), 'N/A')
+);
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- Only the backend (service-role key) may call this. SECURITY DEFINER
+-- with a caller-supplied uid would otherwise let any authenticated user
+-- read another user's data through the PostgREST RPC endpoint,
+-- bypassing the auth.uid() RLS policies; PUBLIC is revoked because
+-- CREATE FUNCTION grants it EXECUTE by default.
+REVOKE EXECUTE ON FUNCTION search_insights(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION search_insights(UUID) TO service_role;
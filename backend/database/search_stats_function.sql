@@ -0,0 +1,32 @@
+-- Search Stats Aggregate Function
+-- Collapses the per-metric COUNT round-trips issued by
+-- /api/researcher/analytics into a single query. The FILTER clauses
+-- share one scan of search_history instead of one scan per count.
+
+-- Run this in Supabase SQL Editor
+
+CREATE OR REPLACE FUNCTION search_stats(uid UUID)
+RETURNS TABLE (
+    total_searches BIGINT,
+    searches_this_month BIGINT,
+    recent_searches BIGINT,
+    saved_participants BIGINT,
+    high_quality_matches BIGINT
+) AS $$
+    SELECT
+        count(*) AS total_searches,
+        count(*) FILTER (WHERE created_at >= now() - interval '30 days') AS searches_this_month,
+        count(*) FILTER (WHERE created_at >= now() - interval '7 days') AS recent_searches,
+        (SELECT count(*) FROM saved_participants WHERE researcher_id = uid) AS saved_participants,
+        count(*) FILTER (WHERE results_count >= 5) AS high_quality_matches
+    FROM search_history
+    WHERE user_id = uid;
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- Only the backend (service-role key) may call this. SECURITY DEFINER
+-- with a caller-supplied uid would otherwise let any authenticated user
+-- read another user's data through the PostgREST RPC endpoint,
+-- bypassing the auth.uid() RLS policies; PUBLIC is revoked because
+-- CREATE FUNCTION grants it EXECUTE by default.
+REVOKE EXECUTE ON FUNCTION search_stats(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION search_stats(UUID) TO service_role;
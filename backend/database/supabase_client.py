@@ -3,11 +3,27 @@ Supabase client initialization and helper functions.
 """
 
 from supabase import create_client, Client
+
+try:  # Exported at top level from supabase 2.4 onwards
+    from supabase import AsyncClient, acreate_client
+except ImportError:
+    from supabase._async.client import AsyncClient
+    from supabase._async.client import create_client as acreate_client
+
+from supabase.client import ClientOptions
+
 from config import settings
 from typing import Optional
 
-# Global Supabase client instance
+# Global Supabase client instances
 _supabase_client: Optional[Client] = None
+_async_supabase_client: Optional[AsyncClient] = None
+
+# PostgREST requests ride httpx's keep-alive pool (20 keep-alive / 100
+# max connections by default), so connections are reused across calls.
+# A bounded timeout keeps a stuck request from pinning a pool slot -
+# supabase-py does not expose finer httpx pool tuning to inject here.
+_CLIENT_OPTIONS = ClientOptions(postgrest_client_timeout=10)
 
 
 def get_supabase() -> Client:
@@ -22,7 +38,8 @@ def get_supabase() -> Client:
     if _supabase_client is None:
         _supabase_client = create_client(
             supabase_url=settings.supabase_url,
-            supabase_key=settings.supabase_service_key
+            supabase_key=settings.supabase_service_key,
+            options=_CLIENT_OPTIONS
         )
     
     return _supabase_client
@@ -33,6 +50,30 @@ def get_supabase_client() -> Client:
     return get_supabase()
 
 
+async def get_async_supabase() -> AsyncClient:
+    """
+    Get or create the async Supabase client instance.
+
+    Built lazily inside a running event loop - the underlying httpx
+    AsyncClient must be bound to the loop that drives it. Async routes
+    should prefer this over the sync client so database I/O awaits on
+    the loop instead of hopping through the thread pool.
+
+    Returns:
+        AsyncClient: Async Supabase client
+    """
+    global _async_supabase_client
+
+    if _async_supabase_client is None:
+        _async_supabase_client = await acreate_client(
+            supabase_url=settings.supabase_url,
+            supabase_key=settings.supabase_service_key,
+            options=_CLIENT_OPTIONS
+        )
+
+    return _async_supabase_client
+
+
 # Initialize client on module import
 supabase: Client = get_supabase()
 
@@ -0,0 +1,42 @@
+-- User Behavior Function
+-- Collapses the three round-trips the recommendation service issued
+-- (search_history, saved_participants ids, participants IN (...)) into
+-- one call; Postgres fuses the history scan and the saved-participant
+-- join server-side and ships a single JSONB payload back.
+
+-- Run this in Supabase SQL Editor
+
+-- Index notes: the history scan is covered by
+-- idx_search_history_user_created_id (search_history_keyset_index.sql)
+-- and the join probe by the UNIQUE(researcher_id, participant_id)
+-- constraint on saved_participants (schema.sql).
+
+CREATE OR REPLACE FUNCTION get_user_behavior(uid UUID, history_limit INT DEFAULT 20)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'search_queries', COALESCE((
+            SELECT jsonb_agg(s.query_text)
+            FROM (
+                SELECT query_text
+                FROM search_history
+                WHERE user_id = uid
+                ORDER BY created_at DESC
+                LIMIT history_limit
+            ) s
+        ), '[]'::jsonb),
+        'saved_participants', COALESCE((
+            SELECT jsonb_agg(to_jsonb(p))
+            FROM saved_participants sp
+            JOIN participants p ON p.id = sp.participant_id
+            WHERE sp.researcher_id = uid
+        ), '[]'::jsonb)
+    );
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- Only the backend (service-role key) may call this. SECURITY DEFINER
+-- with a caller-supplied uid would otherwise let any authenticated user
+-- read another user's data through the PostgREST RPC endpoint,
+-- bypassing the auth.uid() RLS policies; PUBLIC is revoked because
+-- CREATE FUNCTION grants it EXECUTE by default.
+REVOKE EXECUTE ON FUNCTION get_user_behavior(UUID, INT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION get_user_behavior(UUID, INT) TO service_role;
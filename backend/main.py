@@ -3,6 +3,9 @@ Recruitr Backend - FastAPI Application
 Main entry point for the Recruitr API server.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from config import settings
@@ -13,15 +16,39 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure Google Gemini globally
-if settings.gemini_api_key:
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application startup/shutdown hook.
+
+    Configures Google Gemini here instead of at module import so the SDK
+    init runs once per worker after the event loop starts, keeping startup
+    cost measurable and out of the import path.
+    """
+    if settings.gemini_api_key:
+        try:
+            genai.configure(api_key=settings.gemini_api_key)
+            logger.info("✅ Google Gemini API configured globally")
+            # Pay agent construction and the first TLS handshake here
+            # instead of on the first user request
+            from services.agent import warmup
+            await warmup()
+        except Exception as e:
+            logger.error(f"❌ Failed to configure Google Gemini: {e}")
+    else:
+        logger.warning("⚠️ GEMINI_API_KEY not found. AI features will be disabled.")
+
+    # Build the search index (participant load + BM25/SBERT) before
+    # serving traffic, so concurrent first requests don't race to
+    # construct it; to_thread keeps the loop responsive meanwhile
+    from services.researcher.search_service import warmup as warm_search_service
     try:
-        genai.configure(api_key=settings.gemini_api_key)
-        logger.info("✅ Google Gemini API configured globally")
+        await asyncio.to_thread(warm_search_service)
+        logger.info("✅ Search service warmed up")
     except Exception as e:
-        logger.error(f"❌ Failed to configure Google Gemini: {e}")
-else:
-    logger.warning("⚠️ GEMINI_API_KEY not found. AI features will be disabled.")
+        logger.error(f"❌ Search service warmup failed: {e}")
+    yield
 
 # Import routes (will be implemented)
 # from routes import auth, researcher, participant
@@ -31,7 +58,8 @@ app = FastAPI(
     description="AI-Assisted Participant Finder for User Research",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
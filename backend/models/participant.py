@@ -2,16 +2,22 @@
 Participant data models.
 """
 
-from pydantic import BaseModel, EmailStr
+import re
+from pydantic import BaseModel, field_validator
 from typing import Optional, List
 from datetime import datetime
 
+# Structural email check. EmailStr pulls in email-validator which does
+# IDN/DNS-level normalization per instance - overkill for server-side
+# participant rows and slow when deserializing bulk payloads.
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
 
 class Participant(BaseModel):
     """Participant profile model."""
     id: str
     name: str
-    email: Optional[EmailStr] = None
+    email: Optional[str] = None
     
     # Professional info
     role: str
@@ -40,6 +46,13 @@ class Participant(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+    @field_validator('email')
+    @classmethod
+    def _validate_email(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None and not _EMAIL_RE.match(v):
+            raise ValueError("Invalid email address")
+        return v
+
 
 class ParticipantWithScore(Participant):
     """Participant with search relevance score."""
@@ -50,7 +63,7 @@ class ParticipantWithScore(Participant):
 class ParticipantCreate(BaseModel):
     """Create participant request."""
     name: str
-    email: Optional[EmailStr] = None
+    email: Optional[str] = None
     role: str
     industry: Optional[str] = None
     company_name: Optional[str] = None
@@ -62,6 +75,13 @@ class ParticipantCreate(BaseModel):
     skills: List[str] = []
     description: Optional[str] = None
 
+    @field_validator('email')
+    @classmethod
+    def _validate_email(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None and not _EMAIL_RE.match(v):
+            raise ValueError("Invalid email address")
+        return v
+
 
 class ParticipantUpdate(BaseModel):
     """Update participant request."""
@@ -38,9 +38,26 @@ class Project(BaseModel):
     updated_at: str
 
 
+class ProjectSummary(BaseModel):
+    """Lightweight project view for list endpoints.
+
+    Omits the potentially large `participants` JSONB payload so listing
+    projects stays cheap regardless of how many candidates each holds.
+    """
+    id: str
+    user_id: str
+    name: str
+    description: str
+    goal: str
+    status: str
+    participant_ids: List[str] = []
+    created_at: str
+    updated_at: str
+
+
 class ProjectListResponse(BaseModel):
     """Response for listing projects."""
-    projects: List[Project]
+    projects: List[ProjectSummary]
     count: int
 
 
@@ -81,22 +81,9 @@ class SearchHistoryResponse(BaseModel):
     page: int = 1
     limit: int = 50
     total_pages: int = 1
-
-
-class GenerateOutreachRequest(BaseModel):
-    """Request to generate outreach message."""
-    participant_id: str
-    project_name: str
-    project_description: str
-    tone: str = "friendly"  # friendly, professional, casual
-    length: str = "medium"  # short, medium, long
-
-
-class GenerateOutreachResponse(BaseModel):
-    """Generated outreach message response."""
-    message: str
-    participant: Dict[str, Any]
-    metadata: Optional[Dict[str, Any]] = None
+    # Opaque keyset cursor for the next page; None when exhausted or
+    # when the legacy page/offset parameters were used.
+    next_cursor: Optional[str] = None
 
 
 class GenerateQuestionsRequest(BaseModel):
@@ -207,3 +194,16 @@ class NotificationsResponse(BaseModel):
     count: int
     unread_count: int
 
+
+# Build every CoreSchema eagerly at import time so no request pays
+# first-use schema construction.
+for _model in (
+    SearchFilters, SearchRequest, SearchResponse, SearchHistory,
+    LogSearchRequest, SearchHistoryItem, SearchHistoryResponse,
+    GenerateQuestionsRequest, InterviewQuestion, GenerateQuestionsResponse,
+    ExportRequest, SaveParticipantRequest, GenerateOutreachRequest,
+    GeneratedEmail, GenerateOutreachResponse, SaveDraftRequest,
+    OutreachDraft, DraftListResponse, CreateNotificationRequest,
+    Notification, NotificationsResponse,
+):
+    _model.model_rebuild()
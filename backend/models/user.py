@@ -2,11 +2,20 @@
 User and authentication models.
 """
 
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+import re
+
+from pydantic import BaseModel, ConfigDict, StringConstraints
+from typing import Annotated, Optional
 from datetime import datetime
 from enum import Enum
 
+# Syntactic check only. Auth endpoints do not need RFC/DNS-level email
+# validation, and avoiding EmailStr keeps the email-validator import
+# chain out of the hot signup/login path.
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+Email = Annotated[str, StringConstraints(pattern=_EMAIL_RE.pattern)]
+
 
 class UserRole(str, Enum):
     """User role types."""
@@ -16,8 +25,11 @@ class UserRole(str, Enum):
 
 class UserProfile(BaseModel):
     """User profile model."""
+
+    model_config = ConfigDict(use_enum_values=True, extra="ignore")
+
     id: str
-    email: EmailStr
+    email: Email
     full_name: Optional[str] = None
     role: UserRole
     
@@ -31,13 +43,10 @@ class UserProfile(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        use_enum_values = True
-
 
 class SignupRequest(BaseModel):
     """Signup request model."""
-    email: EmailStr
+    email: Email
     password: str
     full_name: Optional[str] = None
     role: UserRole = UserRole.RESEARCHER
@@ -49,7 +58,7 @@ class SignupRequest(BaseModel):
 
 class LoginRequest(BaseModel):
     """Login request model."""
-    email: EmailStr
+    email: Email
     password: str
 
 
@@ -59,3 +68,8 @@ class AuthResponse(BaseModel):
     access_token: str
     refresh_token: Optional[str] = None
 
+
+# Build every CoreSchema eagerly at import time so no request pays
+# first-use schema construction.
+for _model in (UserProfile, SignupRequest, LoginRequest, AuthResponse):
+    _model.model_rebuild()
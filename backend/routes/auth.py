@@ -5,12 +5,13 @@ TODO: Implement authentication endpoints using Supabase Auth.
 """
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from models.user import SignupRequest, LoginRequest, AuthResponse
 
 router = APIRouter()
 
 
-@router.post("/signup", response_model=AuthResponse)
+@router.post("/signup", response_model=AuthResponse, response_class=ORJSONResponse)
 async def signup(request: SignupRequest):
     """
     Create a new user account.
@@ -33,7 +34,7 @@ async def signup(request: SignupRequest):
     )
 
 
-@router.post("/login", response_model=AuthResponse)
+@router.post("/login", response_model=AuthResponse, response_class=ORJSONResponse)
 async def login(request: LoginRequest):
     """
     Sign in to existing account.
@@ -56,7 +57,7 @@ async def login(request: LoginRequest):
     )
 
 
-@router.post("/logout")
+@router.post("/logout", response_class=ORJSONResponse)
 async def logout():
     """
     Sign out current user.
@@ -70,7 +71,7 @@ async def logout():
     )
 
 
-@router.post("/refresh")
+@router.post("/refresh", response_class=ORJSONResponse)
 async def refresh_token():
     """
     Refresh access token.
@@ -3,12 +3,17 @@ Projects API routes - AI-assisted research projects.
 Allows researchers to create projects using natural language goals.
 """
 
+import asyncio
+import heapq
 import logging
+import uuid
+from functools import lru_cache
+from itertools import count
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from typing import List
 
 from middleware.auth import get_current_user
-from database import supabase
 from models.project import (
     CreateProjectRequest,
     Project,
@@ -17,14 +22,52 @@ from models.project import (
     AgentResponse,
     ProjectStrategy
 )
-from services.agent import get_agent
-from services.researcher.search_service import get_search_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Columns for the list view - deliberately excludes the `participants`
+# JSONB blob, which can run to hundreds of KB per project row.
+_PROJECT_SUMMARY_COLUMNS = (
+    "id,user_id,name,description,goal,status,"
+    "participant_ids,created_at,updated_at"
+)
+
+# Fields a PATCH request may touch; anything else is dropped.
+_ALLOWED_UPDATE_FIELDS = frozenset(
+    ("name", "description", "status", "participant_ids", "participants", "notes")
+)
+
+
+# Heavy modules (Supabase SDK, agent, search stack with SBERT/BM25) are
+# imported lazily so importing this module only touches FastAPI and
+# Pydantic - keeps worker cold-start and --reload cycles fast.
+
+async def _db():
+    """Import and return the shared async Supabase client on first use.
+
+    The client itself is memoized in the database package; routes await
+    its queries directly instead of hopping through the thread pool.
+    """
+    from database import get_async_supabase
+    return await get_async_supabase()
+
+
+@lru_cache(maxsize=1)
+def _agent():
+    """Import and return the shared recruitment agent on first use."""
+    from services.agent import get_agent
+    return get_agent()
+
 
-@router.post("/projects", response_model=AgentResponse)
+@lru_cache(maxsize=1)
+def _search():
+    """Import and return the shared search service on first use."""
+    from services.researcher.search_service import get_search_service
+    return get_search_service()
+
+
+@router.post("/projects", response_model=AgentResponse, response_class=ORJSONResponse)
 async def create_project_with_agent(
     request: CreateProjectRequest,
     user = Depends(get_current_user)
@@ -44,9 +87,9 @@ async def create_project_with_agent(
     """
     try:
         logger.info(f"Creating AI project for user {user.id}")
-        
+
         # Step 1: Parse research goal with AI
-        agent = get_agent()
+        agent = _agent()
         strategy_data = await agent.parse_research_goal(request.goal)
         
         project_name = request.name or strategy_data.get("project_name", "Research Project")
@@ -57,39 +100,69 @@ async def create_project_with_agent(
         
         logger.info(f"Generated strategy with {len(search_queries)} queries")
         
-        # Step 2: Execute searches and collect candidates
-        search_service = get_search_service()
-        all_participants = []
+        # Step 2: Execute searches concurrently and collect candidates.
+        # Each search is I/O-bound (embedding + vector store), so running
+        # them in parallel collapses wall-clock to the slowest query; the
+        # semaphore caps fan-out to avoid overwhelming the search stack.
+        search_service = _search()
+        semaphore = asyncio.Semaphore(8)
+
+        async def _run_search(query: str):
+            async with semaphore:
+                try:
+                    response = await asyncio.to_thread(
+                        search_service.search,
+                        query=query,
+                        top_k=50,  # Get more candidates per query
+                        filters=None
+                    )
+                    return query, response
+                except Exception as e:
+                    return query, e
+
+        # Consume responses as they finish so dedup overlaps with
+        # still-in-flight searches, and keep only a bounded min-heap of
+        # the best-scoring candidates. Ids are remembered for dedup, but
+        # full participant records never exceed pool_cap in memory.
+        # Growth rehashes are not worth pre-sizing against: CPython offers
+        # no capacity hint, and dict.clear() releases the table anyway.
+        pool_cap = max(target_count * 3, 50)
         seen_ids = set()
-        
-        for query in search_queries:
-            try:
-                search_response = search_service.search(
-                    query=query,
-                    top_k=50,  # Get more candidates per query
-                    filters=None
-                )
-                
-                # Extract and deduplicate participants
-                results = search_response.get('results', [])
-                
-                for result in results:
-                    participant_data = result.get('participant', {})
-                    participant_id = participant_data.get('id')
-                    
-                    if participant_id and participant_id not in seen_ids:
-                        seen_ids.add(participant_id)
-                        all_participants.append({
-                            **participant_data,
-                            'score': result.get('score', 0)
-                        })
-                
-            except Exception as e:
-                logger.warning(f"Search failed for query '{query}': {e}")
+        pool = []  # min-heap of (score, tiebreak, participant)
+        tiebreak = count()
+
+        for future in asyncio.as_completed(
+            [_run_search(query) for query in search_queries]
+        ):
+            query, search_response = await future
+
+            if isinstance(search_response, Exception):
+                logger.warning(f"Search failed for query '{query}': {search_response}")
                 continue
-        
-        logger.info(f"Found {len(all_participants)} unique participants")
-        
+
+            for result in search_response.get('results', []):
+                get = result.get
+                participant_data = get('participant')
+                participant_id = participant_data.get('id') if participant_data else None
+
+                if not participant_id or participant_id in seen_ids:
+                    continue
+
+                seen_ids.add(participant_id)
+                score = get('score', 0)
+                participant_data['score'] = score
+
+                entry = (score, next(tiebreak), participant_data)
+                if len(pool) < pool_cap:
+                    heapq.heappush(pool, entry)
+                else:
+                    heapq.heappushpop(pool, entry)
+
+        all_participants = [participant for _, _, participant in pool]
+        total_found = len(seen_ids)
+
+        logger.info(f"Found {total_found} unique participants")
+
         # Step 3: Rank and filter to top candidates
         top_participants = await agent.rank_participants(
             all_participants,
@@ -104,8 +177,24 @@ async def create_project_with_agent(
             top_participants
         )
         
-        # Step 5: Save project to database
+        # Step 5: Save project to database. Collect ids and drop id-less
+        # entries in one traversal instead of re-scanning the list.
+        participant_ids = []
+        kept = []
+        for p in top_participants:
+            pid = p.get('id')
+            if pid:
+                participant_ids.append(pid)
+                kept.append(p)
+        top_participants = kept
+
+        # Generate the id client-side so the insert can use a minimal
+        # return - we already hold everything the response needs locally
+        # and skip re-downloading the participants blob we just uploaded.
+        project_id = str(uuid.uuid4())
+
         project_data = {
+            "id": project_id,
             "user_id": user.id,
             "name": project_name,
             "description": description,
@@ -116,25 +205,20 @@ async def create_project_with_agent(
                 "target_count": target_count,
                 "reasoning": reasoning
             },
-            "participant_ids": [p.get('id') for p in top_participants if p.get('id')],
+            "participant_ids": participant_ids,
             "participants": top_participants,
             "search_queries": search_queries
         }
         
-        result = supabase.table("projects").insert(project_data).execute()
-        
-        if not result.data:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create project"
-            )
-        
-        project = result.data[0]
-        logger.info(f"Created project {project['id']} with {len(top_participants)} participants")
-        
-        # Return structured response
+        # Failures surface as APIError and fall through to the 500 handler.
+        db = await _db()
+        await db.table("projects").insert(project_data, returning="minimal").execute()
+
+        logger.info(f"Created project {project_id} with {len(top_participants)} participants")
+
+        # Return structured response built from local data
         return AgentResponse(
-            project_id=project['id'],
+            project_id=project_id,
             project_name=project_name,
             strategy=ProjectStrategy(
                 search_queries=search_queries,
@@ -142,7 +226,7 @@ async def create_project_with_agent(
                 reasoning=reasoning
             ),
             participants=top_participants,
-            total_found=len(all_participants),
+            total_found=total_found,
             message=summary
         )
         
@@ -162,7 +246,7 @@ async def create_project_with_agent(
         )
 
 
-@router.get("/projects", response_model=ProjectListResponse)
+@router.get("/projects", response_model=ProjectListResponse, response_class=ORJSONResponse)
 async def list_projects(user = Depends(get_current_user)):
     """
     Get all projects for the current user.
@@ -171,8 +255,9 @@ async def list_projects(user = Depends(get_current_user)):
         List of projects ordered by creation date (newest first)
     """
     try:
-        result = supabase.table("projects") \
-            .select("*") \
+        db = await _db()
+        result = await db.table("projects") \
+            .select(_PROJECT_SUMMARY_COLUMNS) \
             .eq("user_id", user.id) \
             .order("created_at", desc=True) \
             .execute()
@@ -190,7 +275,7 @@ async def list_projects(user = Depends(get_current_user)):
         )
 
 
-@router.get("/projects/{project_id}", response_model=Project)
+@router.get("/projects/{project_id}", response_model=Project, response_class=ORJSONResponse)
 async def get_project(project_id: str, user = Depends(get_current_user)):
     """
     Get a specific project by ID.
@@ -202,7 +287,8 @@ async def get_project(project_id: str, user = Depends(get_current_user)):
         Project details including strategy and participants
     """
     try:
-        result = supabase.table("projects") \
+        db = await _db()
+        result = await db.table("projects") \
             .select("*") \
             .eq("id", project_id) \
             .eq("user_id", user.id) \
@@ -226,7 +312,7 @@ async def get_project(project_id: str, user = Depends(get_current_user)):
         )
 
 
-@router.patch("/projects/{project_id}", response_model=Project)
+@router.patch("/projects/{project_id}", response_model=Project, response_class=ORJSONResponse)
 async def update_project(
     project_id: str,
     request: UpdateProjectRequest,
@@ -243,12 +329,13 @@ async def update_project(
         Updated project
     """
     try:
-        # Build update data from non-None fields
-        update_data = {}
-        for field in ['name', 'description', 'status', 'participant_ids', 'participants', 'notes']:
-            value = getattr(request, field, None)
-            if value is not None:
-                update_data[field] = value
+        # Pydantic already tracks which fields the client actually sent;
+        # exclude_unset reads that directly instead of reflecting over an
+        # attribute list, and distinguishes "set to null" from "absent".
+        update_data = {
+            k: v for k, v in request.model_dump(exclude_unset=True).items()
+            if k in _ALLOWED_UPDATE_FIELDS
+        }
         
         if not update_data:
             raise HTTPException(
@@ -256,7 +343,8 @@ async def update_project(
                 detail="No fields to update"
             )
         
-        result = supabase.table("projects") \
+        db = await _db()
+        result = await db.table("projects") \
             .update(update_data) \
             .eq("id", project_id) \
             .eq("user_id", user.id) \
@@ -280,7 +368,7 @@ async def update_project(
         )
 
 
-@router.delete("/projects/{project_id}")
+@router.delete("/projects/{project_id}", response_class=ORJSONResponse)
 async def delete_project(project_id: str, user = Depends(get_current_user)):
     """
     Delete a project.
@@ -292,7 +380,8 @@ async def delete_project(project_id: str, user = Depends(get_current_user)):
         Success message
     """
     try:
-        result = supabase.table("projects") \
+        db = await _db()
+        result = await db.table("projects") \
             .delete() \
             .eq("id", project_id) \
             .eq("user_id", user.id) \
@@ -4,13 +4,22 @@ Researcher API routes.
 Endpoints for researcher-specific functionality.
 """
 
+import asyncio
+import base64
+import json
+import logging
+from functools import lru_cache
+
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
-import logging
+
+from pydantic import TypeAdapter
 
 from models.search import (
     SearchRequest,
     SearchResponse,
+    GeneratedEmail,
     GenerateOutreachRequest,
     GenerateOutreachResponse,
     SaveParticipantRequest,
@@ -23,15 +32,76 @@ from models.search import (
     Notification,
     NotificationsResponse
 )
-from datetime import datetime, timedelta
 from services.researcher.search_service import get_search_service
-from services.researcher.recommendation_service import get_recommendation_service
+from services.researcher.recommendation_service import (
+    get_recommendation_service,
+    invalidate_user_caches,
+)
 from database import supabase
 from middleware.auth import get_current_user
+from utils import TTLCache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Serializes a whole email list in one pydantic-core call instead of a
+# Python-level .dict() per element when saving drafts.
+_EMAIL_LIST_ADAPTER = TypeAdapter(List[GeneratedEmail])
+
+# Researcher names/companies change rarely; a short TTL spares the
+# outreach path a profile round-trip for repeat callers.
+_profile_cache = TTLCache(maxsize=1024, ttl=60.0)
+
+
+@lru_cache(maxsize=1)
+def _search_service():
+    """Resolve the shared search service once per process.
+
+    The factory memoizes the service itself; caching here also skips the
+    repeated global-check call on every search request. Deliberately not
+    resolved at import time so worker cold-start stays fast.
+    """
+    return get_search_service()
+
+
+async def _execute(query):
+    """Run a blocking PostgREST query on the thread pool.
+
+    Every route here is async; executing the sync Supabase client inline
+    would block the event loop for the whole round-trip.
+    """
+    return await asyncio.to_thread(query.execute)
+
+
+async def _get_profile_cached(user_id: str) -> dict:
+    """Fetch the researcher's outreach profile fields, cached briefly."""
+    profile = _profile_cache.get(user_id)
+    if profile is None:
+        result = await _execute(
+            supabase.table("profiles")
+            .select("full_name, company_name")
+            .eq("id", user_id)
+            .single()
+        )
+        profile = result.data or {}
+        _profile_cache.set(user_id, profile)
+    return profile
+
+
+def _encode_cursor(row: dict) -> str:
+    """Encode a history row's (created_at, id) into an opaque cursor."""
+    payload = {"t": row["created_at"], "id": row["id"]}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor back into (created_at, id). Raises ValueError."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return payload["t"], payload["id"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+
 
 @router.post("/search", response_model=SearchResponse)
 async def search_participants(
@@ -46,24 +116,27 @@ async def search_participants(
         logger.info(f"Search request by {user.id}: '{request.query}'")
         
         # Get search service
-        search_service = get_search_service()
-        
-        # Perform search (fetch all results up to top_k)
-        search_results = search_service.search(
+        search_service = _search_service()
+
+        page = request.page or 1
+        limit = request.limit or 20
+        start_index = (page - 1) * limit
+
+        # Perform search; the service slices the page before enrichment
+        # so only rows the client will see are explained and returned.
+        # The pipeline is CPU-bound (query encode + BM25 + fusion), so
+        # run it in a worker thread to keep the event loop responsive.
+        search_results = await asyncio.to_thread(
+            search_service.search,
             query=request.query,
             top_k=request.top_k or 50,
-            filters=request.filters
+            filters=request.filters,
+            offset=start_index,
+            limit=limit
         )
-        
-        # Apply pagination
-        page = request.page or 1
-        limit = request.limit or 20
+
+        paginated_results = search_results['results']
         total_results = search_results['count']
-        
-        # Calculate pagination
-        start_index = (page - 1) * limit
-        end_index = start_index + limit
-        paginated_results = search_results['results'][start_index:end_index]
         total_pages = (total_results + limit - 1) // limit  # Ceiling division
         
         # Format response with pagination metadata
@@ -91,6 +164,38 @@ async def search_participants(
         )
 
 
+@router.post("/search/stream")
+async def search_participants_stream(
+    request: SearchRequest,
+    user = Depends(get_current_user)
+):
+    """
+    Search with progressive delivery over Server-Sent Events.
+
+    Emits a "partial" event with lexical (BM25) results as soon as they
+    are ready, then a "final" event with the fused hybrid ranking, so
+    the client can render useful rows at BM25 latency.
+    Protected route: Requires valid auth token.
+    """
+    logger.info(f"Streaming search request by {user.id}: '{request.query}'")
+    search_service = _search_service()
+
+    async def event_stream():
+        try:
+            async for event in search_service.search_stream(
+                query=request.query,
+                top_k=request.top_k or 50,
+                filters=request.filters,
+                limit=request.limit or 20
+            ):
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception as e:
+            logger.error(f"Streaming search failed: {str(e)}")
+            yield f"data: {json.dumps({'type': 'error', 'detail': str(e)})}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/search-suggestions")
 async def get_search_suggestions(
     limit: int = 4,
@@ -118,8 +223,11 @@ async def get_search_suggestions(
         # Get recommendation service
         recommendation_service = get_recommendation_service()
         
-        # Generate suggestions
-        result = recommendation_service.get_search_suggestions(
+        # Generate suggestions off-loop: cache misses make synchronous
+        # Supabase round-trips, and the service's TTL caches are
+        # thread-safe
+        result = await asyncio.to_thread(
+            recommendation_service.get_search_suggestions,
             user_id=user.id,
             limit=limit
         )
@@ -151,7 +259,7 @@ async def get_participant(participant_id: str):
         Full participant data
     """
     try:
-        search_service = get_search_service()
+        search_service = _search_service()
         participant = search_service.get_participant_by_id(participant_id)
         
         if not participant:
@@ -172,6 +280,39 @@ async def get_participant(participant_id: str):
         )
 
 
+# Search logging is buffered and flushed in batches: one INSERT per
+# flush interval instead of one per logged search. All buffer access
+# happens on the event loop, so no lock is needed.
+_SEARCH_LOG_BUFFER: List[dict] = []
+_SEARCH_LOG_FLUSH_INTERVAL = 0.5  # seconds
+_search_log_flusher_task = None
+
+
+async def _search_log_flusher():
+    """Drain the search-log buffer with one batched insert per tick."""
+    while True:
+        await asyncio.sleep(_SEARCH_LOG_FLUSH_INTERVAL)
+        if not _SEARCH_LOG_BUFFER:
+            continue
+        # Snapshot and truncate without awaiting in between so rows
+        # appended mid-flush are never lost.
+        batch = _SEARCH_LOG_BUFFER[:]
+        del _SEARCH_LOG_BUFFER[:len(batch)]
+        try:
+            await _execute(supabase.table("search_history").insert(batch))
+        except Exception as e:
+            logger.error(f"Failed to flush {len(batch)} search logs: {e}")
+
+
+def _ensure_search_log_flusher():
+    """Start the flusher on the running loop the first time it's needed."""
+    global _search_log_flusher_task
+    if _search_log_flusher_task is None or _search_log_flusher_task.done():
+        _search_log_flusher_task = asyncio.get_running_loop().create_task(
+            _search_log_flusher()
+        )
+
+
 @router.post("/searches/log")
 async def log_search(
     request: LogSearchRequest,
@@ -180,59 +321,91 @@ async def log_search(
     """
     Log a search to history.
     Protected route.
+
+    Entries are buffered in-process and flushed in batches by a
+    background task - logging is best-effort and never holds up the
+    client for a database round-trip.
     """
-    try:
-        logger.info(f"💾 Logging search for user: {user.id}, query: '{request.query_text}'")
-        
-        result = supabase.table("search_history").insert({
-            "user_id": user.id,
-            "query_text": request.query_text,
-            "filters": request.filters or {},
-            "search_type": request.search_type,
-            "results_count": request.results_count,
-            "top_result_ids": request.top_result_ids or [],
-        }).execute()
-        
-        logger.info(f"✅ Search logged with ID: {result.data[0]['id']}")
-        return {"message": "Search logged successfully", "id": result.data[0]["id"]}
-    except Exception as e:
-        logger.error(f"Failed to log search: {e}")
-        # Don't fail the search if logging fails
-        return {"message": "Search logging failed", "error": str(e)}
+    logger.info(f"💾 Logging search for user: {user.id}, query: '{request.query_text}'")
+
+    _SEARCH_LOG_BUFFER.append({
+        "user_id": user.id,
+        "query_text": request.query_text,
+        "filters": request.filters or {},
+        "search_type": request.search_type,
+        "results_count": request.results_count,
+        "top_result_ids": request.top_result_ids or [],
+    })
+    _ensure_search_log_flusher()
+    invalidate_user_caches(user.id)
+
+    return {"message": "Search logging queued"}
 
 
 @router.get("/searches", response_model=SearchHistoryResponse)
 async def get_search_history(
     page: int = 1,
     limit: int = 50,
+    cursor: Optional[str] = None,
     user = Depends(get_current_user)
 ):
     """
     Get search history for current user.
     Protected route.
+
+    Pagination: pass the `next_cursor` from a previous response for
+    keyset pagination (index seek, constant cost per page). The `page`
+    parameter remains supported as an OFFSET fallback for old clients.
     """
     try:
         logger.info(f"📥 Fetching search history for user: {user.id}, page: {page}, limit: {limit}")
-        
+
+        if cursor:
+            try:
+                cursor_ts, cursor_id = _decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+
+            # Keyset pagination: seek past the cursor row on the
+            # (user_id, created_at, id) index instead of OFFSET-skipping.
+            result = await _execute(supabase.table("search_history") \
+                .select("*") \
+                .eq("user_id", user.id) \
+                .or_(
+                    f"created_at.lt.{cursor_ts},"
+                    f"and(created_at.eq.{cursor_ts},id.lt.{cursor_id})"
+                ) \
+                .order("created_at", desc=True) \
+                .order("id", desc=True) \
+                .limit(limit))
+
+            rows = result.data
+            next_cursor = _encode_cursor(rows[-1]) if len(rows) == limit else None
+
+            return SearchHistoryResponse(
+                history=rows,
+                count=len(rows),
+                limit=limit,
+                next_cursor=next_cursor
+            )
+
+        # Legacy OFFSET/LIMIT fallback
         # Calculate offset
         offset = (page - 1) * limit
-        
-        # Get total count
-        count_result = supabase.table("search_history") \
-            .select("id", count="exact") \
-            .eq("user_id", user.id) \
-            .execute()
-        
-        total_count = count_result.count or 0
-        total_pages = (total_count + limit - 1) // limit if total_count > 0 else 1
-        
-        # Get paginated data
-        result = supabase.table("search_history") \
-            .select("*") \
+
+        # One query returns both the page and the exact total via
+        # PostgREST's count preference - no separate COUNT round-trip.
+        result = await _execute(supabase.table("search_history") \
+            .select("*", count="exact") \
             .eq("user_id", user.id) \
             .order("created_at", desc=True) \
-            .range(offset, offset + limit - 1) \
-            .execute()
+            .range(offset, offset + limit - 1))
+
+        total_count = result.count or 0
+        total_pages = (total_count + limit - 1) // limit if total_count > 0 else 1
         
         logger.info(f"📊 Found {len(result.data)} search history items")
         if len(result.data) == 0 and total_count > 0:
@@ -244,7 +417,8 @@ async def get_search_history(
             total_count=total_count,
             page=page,
             limit=limit,
-            total_pages=total_pages
+            total_pages=total_pages,
+            next_cursor=_encode_cursor(result.data[-1]) if result.data else None
         )
     except Exception as e:
         logger.error(f"Failed to fetch search history: {e}")
@@ -264,12 +438,12 @@ async def delete_search_history(
     Protected route.
     """
     try:
-        supabase.table("search_history") \
-            .delete() \
+        await _execute(supabase.table("search_history") \
+            .delete(returning="minimal") \
             .eq("id", search_id) \
-            .eq("user_id", user.id) \
-            .execute()
+            .eq("user_id", user.id))
         
+        invalidate_user_caches(user.id)
         return {"message": "Search deleted from history"}
     except Exception as e:
         logger.error(f"Failed to delete search: {e}")
@@ -291,23 +465,27 @@ async def save_participant(
     """
     try:
         researcher_id = user.id
-        
-        # Check if already saved
-        existing = supabase.table("saved_participants").select("*")\
-            .eq("researcher_id", researcher_id)\
-            .eq("participant_id", participant_id)\
-            .execute()
-            
-        if existing.data:
-            return {"message": "Participant already saved"}
 
+        # Single upsert against the UNIQUE(researcher_id, participant_id)
+        # constraint replaces the select-then-insert pair; duplicates are
+        # ignored and show up as an empty result set.
         data = {
             "researcher_id": researcher_id,
             "participant_id": participant_id,
             "notes": request.notes if request else None,
             "tags": request.tags if request else None
         }
-        supabase.table("saved_participants").insert(data).execute()
+        result = await _execute(
+            supabase.table("saved_participants").upsert(
+                data,
+                on_conflict="researcher_id,participant_id",
+                ignore_duplicates=True
+            )
+        )
+
+        if not result.data:
+            return {"message": "Participant already saved"}
+        invalidate_user_caches(researcher_id)
         return {"message": "Participant saved successfully"}
     except Exception as e:
         logger.error(f"Save failed: {e}")
@@ -326,10 +504,11 @@ async def unsave_participant(
     try:
         researcher_id = user.id
         
-        supabase.table("saved_participants").delete()\
+        await _execute(supabase.table("saved_participants").delete(returning="minimal")\
             .eq("researcher_id", researcher_id)\
             .eq("participant_id", participant_id)\
-            .execute()
+            )
+        invalidate_user_caches(researcher_id)
         return {"message": "Participant removed from saved"}
     except Exception as e:
         logger.error(f"Unsave failed: {e}")
@@ -348,10 +527,10 @@ async def get_saved_participants(user = Depends(get_current_user)):
         # Fetch saved participants with their details
         # Note: Join syntax depends on Supabase Python client version
         # Simple join:
-        response = supabase.table("saved_participants")\
+        response = await _execute(supabase.table("saved_participants")\
             .select("*, participants(*)")\
             .eq("researcher_id", researcher_id)\
-            .execute()
+            )
             
         return response.data
     except Exception as e:
@@ -371,29 +550,29 @@ async def generate_outreach(
     participant profiles and researcher context.
     """
     try:
-        from services.researcher.outreach_service import OutreachService
-        
-        # Get researcher profile for personalization
-        researcher_profile = supabase.table("profiles") \
-            .select("full_name, company_name") \
-            .eq("id", user.id) \
-            .single() \
-            .execute()
-        
-        researcher_name = researcher_profile.data.get("full_name", "Researcher")
-        researcher_company = researcher_profile.data.get("company_name")
-        
-        # Fetch participant details
-        participants_data = []
-        for participant_id in request.participant_ids:
-            result = supabase.table("participants") \
-                .select("*") \
-                .eq("id", participant_id) \
-                .single() \
-                .execute()
-            
-            if result.data:
-                participants_data.append(result.data)
+        from services.researcher.outreach_service import get_outreach_service
+        
+        # The researcher profile and the participant batch are
+        # independent lookups - issue them together. Participants come
+        # back in one IN() query and are reordered to the request order.
+        researcher_profile, rows_result = await asyncio.gather(
+            _get_profile_cached(user.id),
+            _execute(
+                supabase.table("participants")
+                .select("*")
+                .in_("id", request.participant_ids)
+            ),
+        )
+
+        researcher_name = researcher_profile.get("full_name", "Researcher")
+        researcher_company = researcher_profile.get("company_name")
+
+        rows = rows_result.data or []
+
+        by_id = {row["id"]: row for row in rows}
+        participants_data = [
+            by_id[pid] for pid in request.participant_ids if pid in by_id
+        ]
         
         if not participants_data:
             raise HTTPException(
@@ -402,7 +581,7 @@ async def generate_outreach(
             )
         
         # Generate outreach emails
-        outreach_service = OutreachService()
+        outreach_service = get_outreach_service()
         emails = await outreach_service.generate_bulk_outreach(
             participants=participants_data,
             researcher_name=researcher_name,
@@ -438,13 +617,13 @@ async def save_draft(
     Save an outreach draft with participants and optionally generated emails.
     """
     try:
-        result = supabase.table("outreach_drafts").insert({
+        result = await _execute(supabase.table("outreach_drafts").insert({
             "user_id": user.id,
             "name": request.name,
             "participant_ids": request.participant_ids,
-            "participants": [p for p in request.participants],
-            "generated_emails": [e.dict() for e in request.generated_emails] if request.generated_emails else None,
-        }).execute()
+            "participants": request.participants,
+            "generated_emails": _EMAIL_LIST_ADAPTER.dump_python(request.generated_emails, mode='json') if request.generated_emails else None,
+        }))
         
         return result.data[0]
     except Exception as e:
@@ -461,11 +640,10 @@ async def get_drafts(user = Depends(get_current_user)):
     Get all outreach drafts for the current user.
     """
     try:
-        result = supabase.table("outreach_drafts") \
+        result = await _execute(supabase.table("outreach_drafts") \
             .select("*") \
             .eq("user_id", user.id) \
-            .order("created_at", desc=True) \
-            .execute()
+            .order("created_at", desc=True))
         
         return DraftListResponse(
             drafts=result.data,
@@ -488,12 +666,11 @@ async def get_draft(
     Get a specific draft by ID.
     """
     try:
-        result = supabase.table("outreach_drafts") \
+        result = await _execute(supabase.table("outreach_drafts") \
             .select("*") \
             .eq("id", draft_id) \
             .eq("user_id", user.id) \
-            .single() \
-            .execute()
+            .single())
         
         if not result.data:
             raise HTTPException(
@@ -520,16 +697,15 @@ async def update_draft(
     Update an existing draft.
     """
     try:
-        result = supabase.table("outreach_drafts") \
+        result = await _execute(supabase.table("outreach_drafts") \
             .update({
                 "name": request.name,
                 "participant_ids": request.participant_ids,
-                "participants": [p for p in request.participants],
-                "generated_emails": [e.dict() for e in request.generated_emails] if request.generated_emails else None,
+                "participants": request.participants,
+                "generated_emails": _EMAIL_LIST_ADAPTER.dump_python(request.generated_emails, mode='json') if request.generated_emails else None,
             }) \
             .eq("id", draft_id) \
-            .eq("user_id", user.id) \
-            .execute()
+            .eq("user_id", user.id))
         
         if not result.data:
             raise HTTPException(
@@ -557,11 +733,10 @@ async def delete_draft(
     Delete a draft.
     """
     try:
-        supabase.table("outreach_drafts") \
-            .delete() \
+        await _execute(supabase.table("outreach_drafts") \
+            .delete(returning="minimal") \
             .eq("id", draft_id) \
-            .eq("user_id", user.id) \
-            .execute()
+            .eq("user_id", user.id))
         
         return {"message": "Draft deleted successfully"}
     except Exception as e:
@@ -597,23 +772,29 @@ async def get_notifications(
     Protected route.
     """
     try:
-        query = supabase.table("notifications") \
-            .select("*") \
-            .eq("user_id", user.id) \
-            .order("created_at", desc=True)
-        
-        if unread_only:
-            query = query.eq("read", False)
-        
-        query = query.limit(limit)
-        result = query.execute()
-        
-        # Count unread notifications
-        unread_result = supabase.table("notifications") \
-            .select("id", count="exact") \
-            .eq("user_id", user.id) \
-            .eq("read", False) \
-            .execute()
+        def _notifications():
+            query = supabase.table("notifications") \
+                .select("*") \
+                .eq("user_id", user.id) \
+                .order("created_at", desc=True)
+
+            if unread_only:
+                query = query.eq("read", False)
+
+            return query.limit(limit).execute()
+
+        def _unread_count():
+            return supabase.table("notifications") \
+                .select("id", count="exact") \
+                .eq("user_id", user.id) \
+                .eq("read", False) \
+                .execute()
+
+        # The list and the unread count are independent; overlap them.
+        result, unread_result = await asyncio.gather(
+            asyncio.to_thread(_notifications),
+            asyncio.to_thread(_unread_count),
+        )
         
         return NotificationsResponse(
             notifications=result.data,
@@ -638,14 +819,14 @@ async def create_notification(
     Protected route.
     """
     try:
-        result = supabase.table("notifications").insert({
+        result = await _execute(supabase.table("notifications").insert({
             "user_id": user.id,
             "title": request.title,
             "message": request.message,
             "type": request.type,
             "related_entity_type": request.related_entity_type,
             "related_entity_id": request.related_entity_id,
-        }).execute()
+        }))
         
         return result.data[0]
     except Exception as e:
@@ -666,14 +847,10 @@ async def mark_notification_read(
     Protected route.
     """
     try:
-        result = supabase.table("notifications") \
-            .update({
-                "read": True,
-                "read_at": datetime.now().isoformat()
-            }) \
+        result = await _execute(supabase.table("notifications") \
+            .update({"read": True}) \
             .eq("id", notification_id) \
-            .eq("user_id", user.id) \
-            .execute()
+            .eq("user_id", user.id))
         
         return {"message": "Notification marked as read"}
     except Exception as e:
@@ -691,14 +868,10 @@ async def mark_all_notifications_read(user = Depends(get_current_user)):
     Protected route.
     """
     try:
-        supabase.table("notifications") \
-            .update({
-                "read": True,
-                "read_at": datetime.now().isoformat()
-            }) \
+        await _execute(supabase.table("notifications") \
+            .update({"read": True}) \
             .eq("user_id", user.id) \
-            .eq("read", False) \
-            .execute()
+            .eq("read", False))
         
         return {"message": "All notifications marked as read"}
     except Exception as e:
@@ -719,11 +892,10 @@ async def delete_notification(
     Protected route.
     """
     try:
-        supabase.table("notifications") \
-            .delete() \
+        await _execute(supabase.table("notifications") \
+            .delete(returning="minimal") \
             .eq("id", notification_id) \
-            .eq("user_id", user.id) \
-            .execute()
+            .eq("user_id", user.id))
         
         return {"message": "Notification deleted"}
     except Exception as e:
@@ -741,11 +913,10 @@ async def get_profile(user = Depends(get_current_user)):
     Protected route.
     """
     try:
-        result = supabase.table("profiles") \
+        result = await _execute(supabase.table("profiles") \
             .select("*") \
             .eq("id", user.id) \
-            .single() \
-            .execute()
+            .single())
         
         if not result.data:
             raise HTTPException(
@@ -785,20 +956,20 @@ async def update_profile(
                 detail="No valid fields to update"
             )
         
-        # Add updated_at timestamp
-        update_data["updated_at"] = datetime.now().isoformat()
-        
-        result = supabase.table("profiles") \
+        result = await _execute(supabase.table("profiles") \
             .update(update_data) \
-            .eq("id", user.id) \
-            .execute()
-        
+            .eq("id", user.id))
+
         if not result.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Profile not found"
             )
-        
+
+        # Drop the cached outreach profile so the new name/company is
+        # picked up immediately.
+        _profile_cache.pop(user.id, None)
+
         return result.data[0]
     except HTTPException:
         raise
@@ -818,104 +989,36 @@ async def get_analytics(user = Depends(get_current_user)):
     """
     try:
         user_id = user.id
-        
-        # Calculate date ranges
-        now = datetime.now()
-        seven_days_ago = now - timedelta(days=7)
-        thirty_days_ago = now - timedelta(days=30)
-        
-        # Total searches (all time)
-        total_searches_result = supabase.table("search_history") \
-            .select("id", count="exact") \
-            .eq("user_id", user_id) \
-            .execute()
-        total_searches = total_searches_result.count or 0
-        
-        # Searches this month
-        searches_this_month_result = supabase.table("search_history") \
-            .select("id", count="exact") \
-            .eq("user_id", user_id) \
-            .gte("created_at", thirty_days_ago.isoformat()) \
-            .execute()
-        searches_this_month = searches_this_month_result.count or 0
-        
-        # Recent searches (last 7 days)
-        recent_searches_result = supabase.table("search_history") \
-            .select("id", count="exact") \
-            .eq("user_id", user_id) \
-            .gte("created_at", seven_days_ago.isoformat()) \
-            .execute()
-        recent_searches = recent_searches_result.count or 0
-        
-        # Total saved participants
-        saved_participants_result = supabase.table("saved_participants") \
-            .select("id", count="exact") \
-            .eq("researcher_id", user_id) \
-            .execute()
-        saved_participants = saved_participants_result.count or 0
-        
-        # Get search history for analysis
-        search_history = supabase.table("search_history") \
-            .select("*") \
-            .eq("user_id", user_id) \
-            .order("created_at", desc=True) \
-            .limit(100) \
-            .execute()
-        
-        # Calculate high quality matches (results with > 5 results)
-        high_quality_matches = sum(
-            1 for search in search_history.data 
-            if search.get("results_count", 0) >= 5
-        )
-        
-        # Get activity data by day for the last 30 days
-        activity_by_day = {}
-        for search in search_history.data:
-            created_at = datetime.fromisoformat(search["created_at"].replace("Z", "+00:00"))
-            date_key = created_at.strftime("%Y-%m-%d")
-            activity_by_day[date_key] = activity_by_day.get(date_key, 0) + 1
-        
-        # Most active day of week
-        day_of_week_counts = {}
-        for search in search_history.data:
-            created_at = datetime.fromisoformat(search["created_at"].replace("Z", "+00:00"))
-            day_name = created_at.strftime("%A")
-            day_of_week_counts[day_name] = day_of_week_counts.get(day_name, 0) + 1
-        
-        most_active_day = max(day_of_week_counts.items(), key=lambda x: x[1])[0] if day_of_week_counts else "N/A"
-        
-        # Average matches per search
-        total_results = sum(search.get("results_count", 0) for search in search_history.data)
-        avg_matches = round(total_results / len(search_history.data), 1) if search_history.data else 0
-        
-        # Analyze most searched terms (simple keyword extraction)
-        from collections import Counter
-        all_queries = [search.get("query_text", "") for search in search_history.data]
-        
-        # Extract roles (simple heuristic - look for common role keywords)
-        role_keywords = ["product manager", "designer", "developer", "engineer", "manager", 
-                        "analyst", "researcher", "marketer", "sales", "recruiter"]
-        role_mentions = Counter()
-        for query in all_queries:
-            query_lower = query.lower()
-            for role in role_keywords:
-                if role in query_lower:
-                    role_mentions[role] += 1
-        
-        most_searched_role = role_mentions.most_common(1)[0][0].title() if role_mentions else "N/A"
-        
-        # Extract tool mentions
-        tool_keywords = ["figma", "sketch", "adobe", "notion", "jira", "slack", 
-                        "trello", "asana", "miro", "invision"]
-        tool_mentions = Counter()
-        for query in all_queries:
-            query_lower = query.lower()
-            for tool in tool_keywords:
-                if tool in query_lower:
-                    tool_mentions[tool] += 1
-        
-        most_used_tool_filter = tool_mentions.most_common(1)[0][0].title() if tool_mentions else "N/A"
-        
+
+        # All counts come from the search_stats SQL function and all
+        # aggregations (daily activity, weekday, averages, keyword
+        # counters) from search_insights - see the matching files in
+        # database/. Two round-trips, overlapped, and no history rows
+        # shipped to Python at all. The role/tool keyword scan that used
+        # to run as nested substring loops here now executes as set-based
+        # LIKE joins over the unnested keyword arrays inside
+        # search_insights, one pass per history row.
+        def _stats():
+            return supabase.rpc("search_stats", {"uid": user_id}).execute()
+
+        def _insights():
+            return supabase.rpc("search_insights", {"uid": user_id}).execute()
+
+        stats_result, insights_result = await asyncio.gather(
+            asyncio.to_thread(_stats),
+            asyncio.to_thread(_insights),
+        )
+
+        stats_row = stats_result.data[0] if stats_result.data else {}
+        total_searches = stats_row.get("total_searches") or 0
+        searches_this_month = stats_row.get("searches_this_month") or 0
+        recent_searches = stats_row.get("recent_searches") or 0
+        saved_participants = stats_row.get("saved_participants") or 0
+        high_quality_matches = stats_row.get("high_quality_matches") or 0
+        
+        insights = insights_result.data or {}
+        activity_by_day = insights.get("activity_by_day") or {}
+
         return {
             "stats": {
                 "total_searches": total_searches,
@@ -925,10 +1028,10 @@ async def get_analytics(user = Depends(get_current_user)):
                 "high_quality_matches": high_quality_matches,
             },
             "insights": {
-                "most_active_day": most_active_day,
-                "avg_matches_per_search": avg_matches,
-                "most_searched_role": most_searched_role,
-                "most_used_tool_filter": most_used_tool_filter,
+                "most_active_day": insights.get("most_active_day", "N/A"),
+                "avg_matches_per_search": insights.get("avg_matches_per_search", 0),
+                "most_searched_role": insights.get("most_searched_role", "N/A"),
+                "most_used_tool_filter": insights.get("most_used_tool_filter", "N/A"),
             },
             "activity_data": [
                 {"date": date, "count": count}
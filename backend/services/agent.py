@@ -3,21 +3,79 @@ AI Agent service for orchestrating research projects.
 Uses LLM to understand user goals and execute search strategies.
 """
 
-import json
 import logging
+import threading
+from functools import lru_cache
 from typing import Dict, List, Any
 
-from services.gemini_helper import get_gemini_model
+import google.generativeai as genai
+import numpy as np
+import orjson
+
+from services.embedder import get_embedder
+from services.gemini_helper import get_gemini_model, ContextCachedModel
+from services.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Enforced server-side so responses are guaranteed raw-parseable JSON -
+# no markdown fences, no cleanup pass, no decode-failure retries.
+_GOAL_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "project_name": {"type": "string"},
+        "description": {"type": "string"},
+        "search_queries": {"type": "array", "items": {"type": "string"}},
+        "target_count": {"type": "integer"},
+        "reasoning": {"type": "string"},
+    },
+    "required": ["project_name", "description", "search_queries", "target_count"],
+}
+
+# Weight of goal-to-participant embedding similarity in the composite
+# ranking score. Cosine similarity lands in [-1, 1], so this sits below
+# the 10x search-relevance weight but above the profile heuristics.
+_SIMILARITY_WEIGHT = 5.0
+
+# Static part of the goal-parsing prompt, shared by every request. Kept
+# separate so it can be uploaded once to Gemini's context cache and only
+# the short "Research goal: ..." suffix travels per call.
+_GOAL_PARSING_PREAMBLE = """You are a UX research assistant helping researchers find study participants.
+
+Given a research goal, generate a structured search strategy.
+
+The participant database contains professionals with:
+- Job titles, companies, roles
+- Skills and tools
+- Work experience
+- Location and remote status
+- Professional bio
+
+Return a JSON object with this exact structure:
+{
+  "project_name": "Concise project name (3-6 words)",
+  "description": "Brief 1-2 sentence description",
+  "search_queries": ["query1", "query2", "query3"],
+  "target_count": 15,
+  "reasoning": "Explanation of search strategy"
+}
+
+Make search queries diverse to capture different aspects of the goal.
+Use specific terms related to roles, skills, tools, and experience levels."""
+
 
 class ResearchAgent:
     """AI agent that helps users find research participants."""
-    
+
     def __init__(self):
         """Initialize the research agent."""
         self.model = None
+        # Near-identical research goals resolve to the same strategy, so
+        # serve them from a semantic cache instead of another Gemini call.
+        self._goal_cache = SemanticCache(threshold=0.92)
+        # Server-side context cache for the static prompt preamble; falls
+        # back to the inline prompt when unavailable.
+        self._goal_context = ContextCachedModel(_GOAL_PARSING_PREAMBLE)
         logger.info("Research agent initialized")
     
     def _get_model(self):
@@ -40,19 +98,39 @@ class ResearchAgent:
             ValueError: If goal cannot be parsed or API is unavailable
         """
         try:
-            model = self._get_model()
-            
-            prompt = self._build_goal_parsing_prompt(goal)
-            response = model.generate_content(prompt)
-            
-            # Extract and parse JSON from response
-            result = self._extract_json_from_response(response.text)
-            
+            cached = self._goal_cache.lookup(goal)
+            if cached is not None:
+                logger.info(f"Semantic cache hit for research goal: '{cached['project_name']}'")
+                return dict(cached)
+
+            generation_config = genai.types.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=_GOAL_RESPONSE_SCHEMA,
+            )
+            cached_model = self._goal_context.get()
+            if cached_model is not None:
+                response = await cached_model.generate_content_async(
+                    f"Research goal: {goal}",
+                    generation_config=generation_config,
+                )
+            else:
+                model = self._get_model()
+                response = await model.generate_content_async(
+                    self._build_goal_parsing_prompt(goal),
+                    generation_config=generation_config,
+                )
+
+            # Schema is enforced server-side, so the text is plain JSON
+            result = orjson.loads(response.text)
+
             # Validate required fields
             required_fields = ['project_name', 'description', 'search_queries', 'target_count']
             if not all(field in result for field in required_fields):
                 raise ValueError(f"Missing required fields in AI response: {required_fields}")
-            
+
+            # Cache a copy so later callers can't mutate the stored entry
+            self._goal_cache.put(goal, dict(result))
+
             logger.info(f"Successfully parsed research goal: '{result['project_name']}'")
             return result
             
@@ -87,14 +165,19 @@ class ResearchAgent:
             return []
         
         try:
-            # Score each participant
-            scored = [(p, self._calculate_participant_score(p)) for p in participants]
-            
-            # Sort by score descending
-            scored.sort(key=lambda x: x[1], reverse=True)
-            
-            # Return top N with original structure
-            top_participants = [p for p, _ in scored[:target_count]]
+            composite = self._score_participants(participants)
+            composite += self._goal_similarities(participants, goal) * _SIMILARITY_WEIGHT
+
+            # Partial selection of the top N is O(N) vs O(N log N) for a
+            # full sort; only the kept slice is then sorted for output.
+            target = min(target_count, len(participants))
+            if target < len(participants):
+                top_idx = np.argpartition(-composite, target)[:target]
+            else:
+                top_idx = np.arange(len(participants))
+            top_idx = top_idx[np.argsort(-composite[top_idx])]
+
+            top_participants = [participants[i] for i in top_idx]
             
             logger.info(
                 f"Ranked {len(participants)} participants, returning top {len(top_participants)}"
@@ -106,9 +189,57 @@ class ResearchAgent:
             # Fallback: return first N participants
             return participants[:target_count]
     
-    def _calculate_participant_score(self, participant: Dict[str, Any]) -> float:
+    @staticmethod
+    def _goal_similarities(participants: List[Dict[str, Any]], goal: str) -> np.ndarray:
+        """
+        Cosine similarity of each participant to the research goal.
+        
+        Uses the stored pgvector embedding when the row carries one and
+        batch-encodes the remaining bios in a single SBERT call; rows
+        with neither score 0. The similarities come from one (N, 384) @
+        (384,) matrix-vector product, so the whole pre-filter costs one
+        goal embedding plus one GEMV - far cheaper than the LLM calls it
+        saves downstream.
+        """
+        embedder = get_embedder()
+        goal_vec = embedder.encode(
+            goal,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        ).astype(np.float32)
+        
+        matrix = np.zeros((len(participants), goal_vec.shape[0]), dtype=np.float32)
+        missing_idx = []
+        missing_bios = []
+        for i, p in enumerate(participants):
+            emb = p.get('embedding')
+            if isinstance(emb, str):
+                # pgvector columns arrive as "[...]" strings over PostgREST
+                emb = orjson.loads(emb)
+            if emb:
+                vector = np.asarray(emb, dtype=np.float32)
+                norm = np.linalg.norm(vector)
+                if norm > 0:
+                    matrix[i] = vector / norm
+            elif p.get('bio'):
+                missing_idx.append(i)
+                missing_bios.append(p['bio'])
+        
+        if missing_bios:
+            matrix[missing_idx] = embedder.encode(
+                missing_bios,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            ).astype(np.float32)
+        
+        return matrix @ goal_vec
+
+    @staticmethod
+    def _score_participants(participants: List[Dict[str, Any]]) -> np.ndarray:
         """
-        Calculate composite score for a participant.
+        Calculate composite scores for all participants at once.
         
         Scoring factors:
         - Base search relevance (10x weight)
@@ -116,31 +247,39 @@ class ResearchAgent:
         - Skills count (+0.5 per skill)
         - Experience years (+0.1 per year, max +2)
         - Has company (+1)
-        """
-        score = 0.0
-        
-        # Primary ranking: search relevance score
-        score += participant.get('score', 0) * 10
-        
-        # Profile completeness bonus
-        if participant.get('bio') and len(participant.get('bio', '')) > 20:
-            score += 2
-        
-        # Skills diversity
-        skills = participant.get('skills', [])
-        if skills:
-            score += len(skills) * 0.5
-        
-        # Experience level
-        years = participant.get('experience_years', 0)
-        if years > 0:
-            score += min(years * 0.1, 2)  # Cap at +2
         
-        # Company affiliation
-        if participant.get('company'):
-            score += 1
+        Builds one column per factor and combines them with a handful of
+        vectorized ops instead of scoring each row in Python.
+        """
+        n = len(participants)
+        scores = np.fromiter(
+            (p.get('score', 0) or 0 for p in participants),
+            dtype=np.float32, count=n
+        )
+        bio_ok = np.fromiter(
+            (1.0 if (b := p.get('bio')) and len(b) > 20 else 0.0 for p in participants),
+            dtype=np.float32, count=n
+        )
+        n_skills = np.fromiter(
+            (len(p.get('skills') or ()) for p in participants),
+            dtype=np.float32, count=n
+        )
+        years = np.fromiter(
+            (p.get('experience_years', 0) or 0 for p in participants),
+            dtype=np.float32, count=n
+        )
+        has_company = np.fromiter(
+            (1.0 if p.get('company') else 0.0 for p in participants),
+            dtype=np.float32, count=n
+        )
         
-        return score
+        return (
+            scores * 10
+            + bio_ok * 2
+            + n_skills * 0.5
+            + np.clip(years * 0.1, 0, 2)
+            + has_company
+        )
     
     async def generate_project_summary(
         self,
@@ -167,96 +306,87 @@ class ResearchAgent:
                 "Try broadening your search or adjusting the goal."
             )
         
-        # Extract insights from top participants
-        roles = set()
-        companies = set()
+        # Extract insights from top participants. Dicts double as
+        # insertion-ordered sets here, so the summary is deterministic,
+        # and the scan stops as soon as both have their 3 examples.
+        roles = {}
+        companies = {}
         
         for p in participants[:10]:
-            if p.get('role'):
-                roles.add(p['role'])
-            if p.get('company'):
-                companies.add(p['company'])
+            if len(roles) >= 3 and len(companies) >= 3:
+                break
+            if p.get('role') and len(roles) < 3:
+                roles[p['role']] = None
+            if p.get('company') and len(companies) < 3:
+                companies[p['company']] = None
         
         # Build summary parts
         parts = [f"Found {count} participants"]
         
         if roles:
-            role_list = ', '.join(list(roles)[:3])
-            parts.append(f"including {role_list}")
+            parts.append(f"including {', '.join(roles)}")
         
         if companies:
-            company_list = ', '.join(list(companies)[:3])
-            parts.append(f"from companies like {company_list}")
+            parts.append(f"from companies like {', '.join(companies)}")
         
         parts.append("Ranked by relevance to your research goal.")
         
         return ' '.join(parts)
     
     @staticmethod
+    @lru_cache(maxsize=256)
     def _build_goal_parsing_prompt(goal: str) -> str:
-        """Build the prompt for parsing research goals."""
-        return f"""You are a UX research assistant helping researchers find study participants.
-
-Given a research goal, generate a structured search strategy.
-
-The participant database contains professionals with:
-- Job titles, companies, roles
-- Skills and tools
-- Work experience
-- Location and remote status
-- Professional bio
-
-Research goal: {goal}
-
-Return a JSON object with this exact structure:
-{{
-  "project_name": "Concise project name (3-6 words)",
-  "description": "Brief 1-2 sentence description",
-  "search_queries": ["query1", "query2", "query3"],
-  "target_count": 15,
-  "reasoning": "Explanation of search strategy"
-}}
+        """Build the inline prompt used when context caching is unavailable.
 
-Make search queries diverse to capture different aspects of the goal.
-Use specific terms related to roles, skills, tools, and experience levels."""
-    
-    @staticmethod
-    def _extract_json_from_response(response_text: str) -> Dict[str, Any]:
-        """
-        Extract JSON from LLM response, handling markdown code blocks.
-        
-        Args:
-            response_text: Raw text from LLM
-            
-        Returns:
-            Parsed JSON dictionary
-            
-        Raises:
-            json.JSONDecodeError: If JSON is invalid
+        Goals repeat across retries and re-runs, so the concatenation is
+        memoized on the goal text.
         """
-        text = response_text.strip()
-        
-        # Remove markdown code blocks if present
-        if text.startswith("```json"):
-            text = text.split("```json", 1)[1].split("```", 1)[0]
-        elif text.startswith("```"):
-            text = text.split("```", 1)[1].split("```", 1)[0]
-        
-        return json.loads(text.strip())
-
-
+        return f"{_GOAL_PARSING_PREAMBLE}\n\nResearch goal: {goal}"
+    
 # Singleton instance management
 _agent_instance = None
+_agent_lock = threading.Lock()
 
 
 def get_agent() -> ResearchAgent:
     """
     Get or create the singleton agent instance.
     
+    Double-checked locking: concurrent first requests would otherwise
+    each construct (and mostly discard) their own agent and model.
+    
     Returns:
         ResearchAgent instance
     """
     global _agent_instance
     if _agent_instance is None:
-        _agent_instance = ResearchAgent()
+        with _agent_lock:
+            if _agent_instance is None:
+                _agent_instance = ResearchAgent()
     return _agent_instance
+
+
+async def warmup() -> None:
+    """
+    Pre-warm the agent and Gemini connection at startup.
+
+    Constructs the singleton, resolves the model, and issues one tiny
+    generation so the TCP/TLS handshake is paid before the first real
+    request. Best-effort: failures are logged and never block startup.
+    """
+    try:
+        from services.researcher.outreach_service import get_outreach_service
+
+        agent = get_agent()
+        # Builds the outreach singleton (and its caches) alongside the
+        # agent; both resolve the same cached model, so one ping covers
+        # the shared connection.
+        get_outreach_service()
+        model = agent._get_model()
+        await model.generate_content_async(
+            "ping",
+            generation_config=genai.types.GenerationConfig(max_output_tokens=1),
+        )
+        logger.info("✅ Gemini warmup complete")
+    except Exception as e:
+        logger.warning(f"Gemini warmup skipped: {e}")
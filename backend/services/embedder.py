@@ -0,0 +1,41 @@
+"""
+Shared helper for Sentence-BERT model loading.
+Provides a process-wide lazily-loaded model shared across the app.
+"""
+
+import logging
+from functools import lru_cache
+
+import torch
+from sentence_transformers import SentenceTransformer
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_embedder() -> SentenceTransformer:
+    """
+    Get the shared SentenceTransformer instance.
+
+    The model costs ~90MB and ~2s to load, so it is constructed once on
+    first use and cached for the process lifetime. Both the API retrieval
+    path and the data generator scripts share this instance.
+
+    Returns:
+        SentenceTransformer in eval mode, on GPU if available
+    """
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    logger.info(f"Loading SBERT model: {settings.sbert_model} (device: {device})")
+    model = SentenceTransformer(settings.sbert_model, device=device)
+    model.eval()
+    # Queries and participant profiles are short; capping the sequence
+    # length bounds the attention cost per forward pass.
+    model.max_seq_length = 128
+    if device == 'cuda':
+        # FP16 halves bandwidth and ALU on GPU; CPU inference stays
+        # FP32 since half precision is emulated (slower) there.
+        model.half()
+    logger.info("✅ SBERT model loaded successfully")
+    return model
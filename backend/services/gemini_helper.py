@@ -3,9 +3,12 @@ Shared helper for Google Gemini API initialization.
 Provides a clean, reusable way to get Gemini models.
 """
 
+import datetime
 import logging
+import threading
+import time
 import google.generativeai as genai
-from typing import Optional
+from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +20,15 @@ AVAILABLE_MODELS = [
     'gemini-1.5-pro',            # More capable
 ]
 
+# Context caching requires an explicitly versioned model
+CONTEXT_CACHE_MODEL = 'models/gemini-1.5-flash-001'
+
+# Resolved models keyed by the requested name (None = auto-detect), so
+# repeated calls skip the probe loop. Guarded by a lock because FastAPI
+# may resolve the first requests on concurrent threads.
+_model_cache: Dict[Optional[str], genai.GenerativeModel] = {}
+_model_lock = threading.Lock()
+
 
 def get_gemini_model(model_name: Optional[str] = None) -> genai.GenerativeModel:
     """
@@ -31,21 +43,91 @@ def get_gemini_model(model_name: Optional[str] = None) -> genai.GenerativeModel:
     Raises:
         ValueError: If no compatible model is found
     """
-    models_to_try = [model_name] if model_name else AVAILABLE_MODELS
-    
-    for name in models_to_try:
-        if not name:
-            continue
-            
-        try:
-            model = genai.GenerativeModel(name)
-            logger.debug(f"✅ Loaded Gemini model: {name}")
+    model = _model_cache.get(model_name)
+    if model is not None:
+        return model
+
+    # Double-checked: only the first caller per name runs the probe loop
+    with _model_lock:
+        model = _model_cache.get(model_name)
+        if model is not None:
             return model
-        except Exception as e:
-            logger.debug(f"Model {name} not available: {e}")
-            continue
-    
-    raise ValueError(
-        f"No compatible Gemini model found. Tried: {', '.join(filter(None, models_to_try))}"
-    )
 
+        models_to_try = [model_name] if model_name else AVAILABLE_MODELS
+
+        for name in models_to_try:
+            if not name:
+                continue
+
+            try:
+                model = genai.GenerativeModel(name)
+                logger.debug(f"✅ Loaded Gemini model: {name}")
+                _model_cache[model_name] = model
+                return model
+            except Exception as e:
+                logger.debug(f"Model {name} not available: {e}")
+                continue
+
+        raise ValueError(
+            f"No compatible Gemini model found. Tried: {', '.join(filter(None, models_to_try))}"
+        )
+
+
+
+class ContextCachedModel:
+    """
+    Lazily managed Gemini context cache for a static prompt preamble.
+
+    Uploading the preamble once via CachedContent means requests only
+    send the short dynamic suffix, cutting per-request input tokens.
+    The cache is created on first use and re-created shortly before its
+    server-side TTL lapses. If the API rejects the cache (for example a
+    preamble below the minimum cacheable token count), get() returns
+    None permanently and callers fall back to inline prompts.
+    """
+
+    def __init__(
+        self,
+        preamble: str,
+        model_name: str = CONTEXT_CACHE_MODEL,
+        ttl_seconds: int = 3600,
+    ):
+        """
+        Initialize the cached-model wrapper.
+
+        Args:
+            preamble: Static prompt prefix to cache server-side
+            model_name: Versioned model the cache is bound to
+            ttl_seconds: Server-side cache lifetime
+        """
+        self.preamble = preamble
+        self.model_name = model_name
+        self.ttl_seconds = ttl_seconds
+        self._cached_content = None
+        self._expires_at = 0.0
+        self._disabled = False
+
+    def get(self) -> Optional[genai.GenerativeModel]:
+        """Return a model bound to the cached preamble, or None on fallback."""
+        if self._disabled:
+            return None
+
+        now = time.monotonic()
+        if self._cached_content is None or now >= self._expires_at:
+            try:
+                self._cached_content = genai.caching.CachedContent.create(
+                    model=self.model_name,
+                    contents=[self.preamble],
+                    ttl=datetime.timedelta(seconds=self.ttl_seconds),
+                )
+                # Refresh with some slack before the server-side TTL
+                self._expires_at = now + self.ttl_seconds * 0.9
+                logger.info(f"Created Gemini context cache for {self.model_name}")
+            except Exception as e:
+                logger.info(f"Context caching unavailable, using inline prompts: {e}")
+                self._disabled = True
+                return None
+
+        return genai.GenerativeModel.from_cached_content(
+            cached_content=self._cached_content
+        )
@@ -3,21 +3,85 @@ Outreach Email Generation Service using Google Gemini.
 Generates personalized recruitment emails for research participants.
 """
 
+import asyncio
+import json
 import logging
-from typing import List, Dict, Optional
+import threading
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Optional
 import google.generativeai as genai
 
-from services.gemini_helper import get_gemini_model
+from services.gemini_helper import get_gemini_model, ContextCachedModel
+from services.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Static instruction block for outreach emails, shared by every request.
+# Kept separate so it can live in Gemini's context cache and only the
+# participant/researcher details travel per call. Subject and body come
+# back together as one JSON object, halving LLM round-trips per email.
+_EMAIL_PROMPT_PREAMBLE = """You are an expert UX researcher who writes compelling, personalized recruitment emails.
+
+Body requirements:
+- Write in first person from the researcher's perspective
+- Be professional but friendly and approachable
+- Explain why their specific experience is valuable
+- Mention that compensation will be provided
+- Keep it concise (150-200 words)
+- Request a 30-45 minute interview
+- Include a clear call to action
+- Do not include a subject line, greeting, signature, or the participant's name
+
+Subject requirements:
+- Professional tone
+- Clear about the purpose (user research invitation)
+- Mention compensation
+- Under 70 characters
+
+Return a JSON object with "subject" and "body" string fields."""
+
+# Plain-text body instructions for the streaming path: a schema-enforced
+# JSON response cannot be rendered token-by-token, so streamed bodies use
+# this preamble and the subject is generated concurrently.
+_STREAM_BODY_PREAMBLE = """You are an expert UX researcher who writes compelling, personalized recruitment emails.
+
+Requirements:
+- Write in first person from the researcher's perspective
+- Be professional but friendly and approachable
+- Explain why their specific experience is valuable
+- Mention that compensation will be provided
+- Keep it concise (150-200 words)
+- Request a 30-45 minute interview
+- Include a clear call to action
+
+Generate ONLY the email body. Do not include a subject line, greeting, signature, or the participant's name."""
+
+# Enforced server-side so the response is guaranteed-parseable JSON and
+# no markdown-fence stripping is needed.
+_EMAIL_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "subject": {"type": "string"},
+        "body": {"type": "string"},
+    },
+    "required": ["subject", "body"],
+}
+
 
 class OutreachService:
     """Service for generating personalized outreach emails using AI."""
-    
+
     def __init__(self):
         """Initialize the outreach service."""
         self.model = None
+        # Prompts are built without participant names (the greeting and
+        # signature carry the personalization), so participants with the
+        # same role/company/description reuse a cached subject/body pair
+        # instead of a fresh Gemini call each.
+        self._email_cache = SemanticCache(threshold=0.92)
+        # Server-side context cache for the static instruction block;
+        # falls back to the inline prompt when unavailable.
+        self._email_context = ContextCachedModel(_EMAIL_PROMPT_PREAMBLE)
         logger.info("Outreach service initialized")
     
     def _get_model(self):
@@ -51,43 +115,21 @@ class OutreachService:
         """
         try:
             model = self._get_model()
-            
-            # Generate email body
-            body_prompt = self._build_email_body_prompt(
-                participant_name,
+
+            context = self._build_email_context(
                 participant_role,
                 participant_company,
                 participant_description,
                 researcher_name,
                 researcher_company,
             )
-            
-            body_response = model.generate_content(
-                body_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens=500,
-                )
-            )
-            
-            email_body = body_response.text.strip()
-            
-            # Generate subject line
-            subject_prompt = self._build_subject_line_prompt(
-                participant_name,
-                participant_role,
-            )
-            
-            subject_response = model.generate_content(
-                subject_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.6,
-                    max_output_tokens=50,
-                )
+            prompt = f"{_EMAIL_PROMPT_PREAMBLE}\n\n{context}"
+
+            # One structured call returns subject and body together
+            subject, email_body = await self._generate_email_parts(
+                model, prompt, context
             )
-            
-            subject = subject_response.text.strip().strip('"\'').strip()
-            
+
             # Format complete email
             complete_body = self._format_email(
                 participant_name,
@@ -128,78 +170,217 @@ class OutreachService:
         Returns:
             List of email dictionaries with 'subject', 'body', 'participant_name' keys
         """
-        emails = []
-        
-        for participant in participants:
-            email = await self.generate_outreach_email(
-                participant_name=participant.get("name"),
-                participant_role=participant.get("role"),
-                participant_company=participant.get("company_name"),
-                participant_description=participant.get("description"),
-                researcher_name=researcher_name,
-                researcher_company=researcher_company,
-            )
-            emails.append(email)
-        
-        return emails
+        # Fan out with a concurrency cap: generation is entirely
+        # network-bound, so N participants cost roughly one email's
+        # latency instead of N, while the semaphore keeps us under
+        # Gemini's rate limits. Failures already degrade to the template
+        # fallback inside generate_outreach_email, so gather never raises.
+        semaphore = asyncio.Semaphore(8)
+
+        async def _generate_one(participant: Dict) -> Dict[str, str]:
+            async with semaphore:
+                return await self.generate_outreach_email(
+                    participant_name=participant.get("name"),
+                    participant_role=participant.get("role"),
+                    participant_company=participant.get("company_name"),
+                    participant_description=participant.get("description"),
+                    researcher_name=researcher_name,
+                    researcher_company=researcher_company,
+                )
+
+        return await asyncio.gather(
+            *(_generate_one(participant) for participant in participants)
+        )
     
-    @staticmethod
-    def _build_email_body_prompt(
+    async def stream_outreach_email(
+        self,
         participant_name: str,
         participant_role: str,
         participant_company: Optional[str],
         participant_description: Optional[str],
         researcher_name: str,
         researcher_company: Optional[str],
-    ) -> str:
-        """Build the prompt for generating email body."""
-        # Build participant context
-        participant_context = f"{participant_name} is a {participant_role}"
-        if participant_company:
-            participant_context += f" at {participant_company}"
-        if participant_description:
-            participant_context += f". {participant_description}"
-        
-        # Build researcher context
-        researcher_context = researcher_name
-        if researcher_company:
-            researcher_context += f" from {researcher_company}"
-        
-        return f"""You are an expert UX researcher who writes compelling, personalized recruitment emails.
+    ) -> AsyncIterator[Dict[str, str]]:
+        """
+        Stream an outreach email as it is generated.
 
-Participant Details:
-{participant_context}
+        Yields "body_delta" events as body tokens arrive (cutting time to
+        first visible text from a full round-trip to the first chunk),
+        then a "subject" event, then a "done" event carrying the complete
+        formatted email. The subject request is launched as soon as the
+        first body chunk confirms the model is responsive, so the two
+        calls overlap. Suitable for a StreamingResponse at the API layer.
+        """
+        try:
+            model = self._get_model()
+
+            context = self._build_email_context(
+                participant_role,
+                participant_company,
+                participant_description,
+                researcher_name,
+                researcher_company,
+            )
+            # Same key as the non-streaming path, so both share hits
+            cache_key = f"{_EMAIL_PROMPT_PREAMBLE}\n\n{context}"
 
-Researcher: {researcher_context}
+            cached = self._email_cache.lookup(cache_key)
+            if cached is not None:
+                subject = cached["subject"]
+                email_body = cached["body"]
+                yield {"type": "body_delta", "text": email_body}
+            else:
+                body_stream = await model.generate_content_async(
+                    f"{_STREAM_BODY_PREAMBLE}\n\n{context}",
+                    stream=True,
+                    generation_config=genai.types.GenerationConfig(
+                        temperature=0.7,
+                        max_output_tokens=500,
+                    )
+                )
 
-Requirements:
-- Write in first person from the researcher's perspective
-- Be professional but friendly and approachable
-- Explain why their specific experience is valuable
-- Mention that compensation will be provided
-- Keep it concise (150-200 words)
-- Request a 30-45 minute interview
-- Include a clear call to action
+                subject_task = None
+                chunks = []
+                async for chunk in body_stream:
+                    if not chunk.text:
+                        continue
+                    if subject_task is None:
+                        subject_task = asyncio.create_task(
+                            self._generate_subject_line(model, participant_role)
+                        )
+                    chunks.append(chunk.text)
+                    yield {"type": "body_delta", "text": chunk.text}
 
-Generate ONLY the email body. Do not include a subject line, greeting, or signature."""
-    
-    @staticmethod
-    def _build_subject_line_prompt(
-        participant_name: str,
-        participant_role: str,
-    ) -> str:
-        """Build the prompt for generating subject line."""
-        return f"""You are an expert at writing effective email subject lines.
+                if subject_task is None:
+                    subject_task = asyncio.create_task(
+                        self._generate_subject_line(model, participant_role)
+                    )
+                subject = await subject_task
+
+                email_body = "".join(chunks).strip()
+                self._email_cache.put(
+                    cache_key, {"subject": subject, "body": email_body}
+                )
+
+            yield {"type": "subject", "text": subject}
+            yield {
+                "type": "done",
+                "subject": subject,
+                "body": self._format_email(
+                    participant_name, email_body, researcher_name
+                ),
+            }
+
+        except Exception as e:
+            logger.error(f"Streaming email generation failed: {e}")
+            fallback = self._generate_fallback_email(
+                participant_name,
+                participant_role,
+                participant_company,
+                researcher_name,
+            )
+            yield {"type": "subject", "text": fallback["subject"]}
+            yield {"type": "body_delta", "text": fallback["body"]}
+            yield {
+                "type": "done",
+                "subject": fallback["subject"],
+                "body": fallback["body"],
+            }
 
-Generate a compelling email subject line for a UX research recruitment email to {participant_name}, a {participant_role}.
+    async def _generate_subject_line(self, model, participant_role: str) -> str:
+        """Generate a subject line for the streaming path."""
+        response = await model.generate_content_async(
+            f"""You are an expert at writing effective email subject lines.
+
+Generate a compelling email subject line for a UX research recruitment email to a {participant_role}.
 
 Requirements:
 - Professional tone
 - Clear about the purpose (user research invitation)
 - Mention compensation
 - Under 70 characters
-- Generate ONLY the subject line text, no quotes or extra formatting"""
-    
+- Generate ONLY the subject line text, no quotes or extra formatting""",
+            generation_config=genai.types.GenerationConfig(
+                temperature=0.6,
+                max_output_tokens=50,
+            )
+        )
+        return response.text.strip().strip('"\'').strip()
+
+    async def _generate_email_parts(
+        self,
+        model,
+        prompt: str,
+        context: str,
+    ) -> tuple:
+        """Generate (or recall) the (subject, body) pair for a built prompt.
+
+        The schema is enforced server-side, so response.text is plain JSON
+        and needs no markdown-fence or quote stripping.
+        """
+        cached = self._email_cache.lookup(prompt)
+        if cached is not None:
+            return cached["subject"], cached["body"]
+
+        generation_config = genai.types.GenerationConfig(
+            response_mime_type="application/json",
+            response_schema=_EMAIL_RESPONSE_SCHEMA,
+            temperature=0.7,
+            max_output_tokens=550,
+        )
+        cached_model = self._email_context.get()
+        if cached_model is not None:
+            response = await cached_model.generate_content_async(
+                context,
+                generation_config=generation_config,
+            )
+        else:
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+            )
+
+        parts = json.loads(response.text)
+        subject = parts["subject"].strip()
+        email_body = parts["body"].strip()
+        self._email_cache.put(prompt, {"subject": subject, "body": email_body})
+        return subject, email_body
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _build_email_context(
+        participant_role: str,
+        participant_company: Optional[str],
+        participant_description: Optional[str],
+        researcher_name: str,
+        researcher_company: Optional[str],
+    ) -> str:
+        """Build the dynamic participant/researcher details block.
+
+        Deliberately name-free: the greeting and signature are added in
+        _format_email, which keeps the prompt (and therefore the semantic
+        cache key) shared across participants with the same profile.
+        Memoized - bulk runs hit the same (role, company, description,
+        researcher) tuples over and over, including None fields, which
+        hash fine as part of the key.
+        """
+        # Single f-strings with conditional parts: no intermediate
+        # strings from a += chain, which adds up over bulk outreach
+        participant_context = (
+            f"The participant is a {participant_role}"
+            f"{f' at {participant_company}' if participant_company else ''}"
+            f"{f'. {participant_description}' if participant_description else ''}"
+        )
+        researcher_context = (
+            f"{researcher_name}"
+            f"{f' from {researcher_company}' if researcher_company else ''}"
+        )
+
+        return f"""Participant Details:
+{participant_context}
+
+Researcher: {researcher_context}"""
+
     @staticmethod
     def _format_email(
         participant_name: str,
@@ -207,7 +388,9 @@ Requirements:
         researcher_name: str,
     ) -> str:
         """Format the complete email with greeting and signature."""
-        first_name = participant_name.split()[0]
+        # partition stops at the first space instead of tokenizing the
+        # whole name the way split() does
+        first_name = participant_name.partition(' ')[0]
         greeting = f"Hi {first_name},"
         signature = f"\n\nBest regards,\n{researcher_name}"
         return f"{greeting}\n\n{email_body}{signature}"
@@ -225,7 +408,7 @@ Requirements:
         Returns:
             Dictionary with subject and body
         """
-        first_name = participant_name.split()[0]
+        first_name = participant_name.partition(' ')[0]
         company_text = f" at {participant_company}" if participant_company else ""
         
         subject = (
@@ -251,3 +434,28 @@ Best regards,
             "body": body,
             "participant_name": participant_name,
         }
+
+
+# Singleton instance management
+_service_instance = None
+_service_lock = threading.Lock()
+
+
+def get_outreach_service() -> OutreachService:
+    """
+    Get or create the singleton outreach service instance.
+
+    A shared instance is what makes the semantic and context caches
+    effective - constructing the service per request would throw the
+    caches away between calls. Double-checked locking mirrors
+    get_agent().
+
+    Returns:
+        OutreachService instance
+    """
+    global _service_instance
+    if _service_instance is None:
+        with _service_lock:
+            if _service_instance is None:
+                _service_instance = OutreachService()
+    return _service_instance
@@ -7,14 +7,87 @@ personalized search query suggestions. Falls back to generic defaults for new us
 
 from typing import List, Dict, Any, Optional
 import logging
+import re
+import threading
+import zlib
 from collections import Counter
 from datetime import datetime
-import random
 
 from database import supabase
+from utils import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Role keywords recognized in past search queries
+_ROLE_KEYWORDS = {
+    'product manager': 'Product Manager',
+    'pm': 'Product Manager',
+    'ux designer': 'UX Designer',
+    'ux': 'UX Designer',
+    'product designer': 'Product Designer',
+    'software engineer': 'Software Engineer',
+    'engineer': 'Software Engineer',
+    'developer': 'Software Engineer',
+    'data scientist': 'Data Scientist',
+    'nurse': 'Nurse Practitioner',
+    'medical': 'Medical Director',
+    'healthcare': 'Healthcare Administrator',
+    'teacher': 'Academic Advisor',
+    'analyst': 'Business Analyst',
+    'accountant': 'Accountant',
+    'financial': 'Financial Analyst',
+    'marketing': 'Marketing Manager',
+    'sales': 'Sales Manager',
+    'manager': 'Operations Manager',
+}
+
+# One C-level scan per query instead of ~20 Python substring tests.
+# Longest-first alternation so "product manager" wins over "pm", and
+# word boundaries so "pm" can't fire inside e.g. "rpm".
+_ROLE_PATTERN = re.compile(
+    r"\b("
+    + "|".join(map(re.escape, sorted(_ROLE_KEYWORDS, key=len, reverse=True)))
+    + r")\b"
+)
+
+# Company-size buckets mapped to the wording used in suggestions
+_SIZE_MAP = {
+    "1-10": "startup",
+    "10-50": "small",
+    "50-200": "mid-size",
+    "200-500": "mid-size",
+    "500-1000": "large",
+    "1000+": "enterprise",
+}
+
+
+def _format_company_size(size: str) -> str:
+    """Map a company-size bucket to readable query wording."""
+    return _SIZE_MAP.get(size, "mid-size")
+
+
+# Behavior queries return identical data for minutes at a time while a
+# user refreshes the homepage, so both the raw behavior fetch and the
+# final suggestion payloads are cached per user for a short TTL. The
+# suggestion cache holds a {limit: result} dict per user so one pop
+# invalidates every limit variant. Trade-off: suggestions stop
+# reshuffling within the TTL window.
+_behavior_cache = TTLCache(maxsize=10_000, ttl=60.0)
+_suggestion_cache = TTLCache(maxsize=10_000, ttl=60.0)
+# Users observed with zero searches and zero saves: their suggestion
+# requests skip the behavior query entirely and get defaults. Held
+# longer than the other caches because the only thing that can change
+# the answer is a write, which invalidates the entry immediately.
+_known_empty_cache = TTLCache(maxsize=10_000, ttl=300.0)
+
+
+def invalidate_user_caches(user_id: str) -> None:
+    """Drop cached behavior and suggestions after a write that changes
+    the user's search history or saved participants."""
+    _behavior_cache.pop(user_id, None)
+    _suggestion_cache.pop(user_id, None)
+    _known_empty_cache.pop(user_id, None)
+
 
 class RecommendationService:
     """
@@ -43,15 +116,16 @@ class RecommendationService:
         "{role} at {company_size} with {experience}+ years experience",
     ]
     
-    # Default suggestions for new users (generic, diverse)
-    DEFAULT_SUGGESTIONS = [
+    # Default suggestions for new users (generic, diverse); a tuple so
+    # per-request slices can never mutate the shared constant
+    DEFAULT_SUGGESTIONS = (
         "Remote professionals with 5+ years experience",
         "Managers at mid-size companies",
         "Specialists using Salesforce",
         "Recent graduates with relevant skills",
         "Project managers in consulting",
         "Analysts at startups",
-    ]
+    )
     
     def __init__(self):
         """Initialize recommendation service."""
@@ -76,8 +150,25 @@ class RecommendationService:
                 - based_on: Dict with activity counts
         """
         try:
+            cached = _suggestion_cache.get(user_id)
+            if cached is not None and limit in cached:
+                return cached[limit]
+
+            # New users with no activity get defaults without a DB trip
+            if _known_empty_cache.get(user_id):
+                return {
+                    "suggestions": self.DEFAULT_SUGGESTIONS[:limit],
+                    "is_personalized": False,
+                    "based_on": {
+                        "searches": 0,
+                        "saved_participants": 0
+                    }
+                }
+
             # Analyze user behavior
             behavior = self._analyze_user_behavior(user_id)
+            if not behavior['search_count'] and not behavior['saved_count']:
+                _known_empty_cache.set(user_id, True)
             
             # Check if we have enough data for personalization
             is_personalized = (
@@ -96,17 +187,17 @@ class RecommendationService:
                 patterns = self._extract_patterns(behavior)
                 
                 # Generate personalized queries
-                suggestions = self._generate_queries(patterns, limit * 2)
+                suggestions = self._generate_queries(patterns, limit * 2, user_id)
                 
-                # Return top N unique suggestions
-                suggestions = list(dict.fromkeys(suggestions))[:limit]
+                # _generate_queries guarantees uniqueness; just slice
+                suggestions = suggestions[:limit]
             else:
                 # Return default suggestions for new users
                 suggestions = self.DEFAULT_SUGGESTIONS[:limit]
             
             logger.info(f"Generated {len(suggestions)} suggestions for user {user_id} (personalized: {is_personalized})")
             
-            return {
+            result = {
                 "suggestions": suggestions,
                 "is_personalized": is_personalized,
                 "based_on": {
@@ -114,6 +205,12 @@ class RecommendationService:
                     "saved_participants": behavior['saved_count']
                 }
             }
+
+            entry = _suggestion_cache.get(user_id) or {}
+            entry[limit] = result
+            _suggestion_cache.set(user_id, entry)
+
+            return result
             
         except Exception as e:
             logger.error(f"Failed to generate suggestions for user {user_id}: {e}")
@@ -141,46 +238,41 @@ class RecommendationService:
                 - search_queries: List of past queries
                 - saved_participants: List of saved participant data
         """
+        cached = _behavior_cache.get(user_id)
+        if cached is not None:
+            return cached
+
         try:
             logger.info(f"🔍 Analyzing behavior for user: {user_id}")
-            
-            # Fetch recent search history (last 20)
-            search_response = supabase.table("search_history").select("*").eq(
-                "user_id", user_id
-            ).order("created_at", desc=True).limit(20).execute()
-            
-            searches = search_response.data or []
-            logger.info(f"📊 Found {len(searches)} searches in history for user {user_id}")
-            
-            # Fetch saved participants with full participant data
-            saved_response = supabase.table("saved_participants").select(
-                "participant_id"
-            ).eq("researcher_id", user_id).execute()
-            
-            saved_ids = [s['participant_id'] for s in (saved_response.data or [])]
-            logger.info(f"💾 Found {len(saved_ids)} saved participants for user {user_id}")
-            
-            # Fetch full participant details for saved participants
-            saved_participants = []
-            if saved_ids:
-                participants_response = supabase.table("participants").select("*").in_(
-                    "id", saved_ids
-                ).execute()
-                saved_participants = participants_response.data or []
-            
+
+            # One RPC returns the recent queries and the saved
+            # participants (already joined to their full rows) together -
+            # see database/user_behavior_function.sql
+            response = supabase.rpc(
+                "get_user_behavior",
+                {"uid": user_id, "history_limit": 20}
+            ).execute()
+
+            data = response.data or {}
+            search_queries = data.get('search_queries') or []
+            saved_participants = data.get('saved_participants') or []
+
             # Debug: log first few search queries
-            if searches:
-                sample_queries = [s.get('query_text', 'N/A')[:50] for s in searches[:3]]
+            if search_queries:
+                sample_queries = [q[:50] for q in search_queries[:3]]
                 logger.info(f"📝 Sample queries: {sample_queries}")
-            
+
             behavior_data = {
-                "search_count": len(searches),
+                "search_count": len(search_queries),
                 "saved_count": len(saved_participants),
-                "search_queries": [s.get('query_text', '') for s in searches],  # Fixed: use query_text
+                "search_queries": search_queries,
                 "saved_participants": saved_participants
             }
             
-            logger.info(f"✅ Behavior analysis complete: {len(searches)} searches, {len(saved_participants)} saved")
+            logger.info(f"✅ Behavior analysis complete: {len(search_queries)} searches, {len(saved_participants)} saved")
+            # Only successful fetches are cached; the zeroed error
+            # fallback below should retry on the next call
+            _behavior_cache.set(user_id, behavior_data)
             return behavior_data
             
         except Exception as e:
@@ -211,56 +303,42 @@ class RecommendationService:
         saved_participants = behavior['saved_participants']
         search_queries = behavior['search_queries']
         
-        # Extract roles from BOTH saved participants AND search queries
-        roles = []
+        # One pass over saved participants feeds every counter - each
+        # dict is touched once instead of once per attribute, and counts
+        # grow in the Counter directly rather than via intermediate lists
+        role_counter = Counter()
+        tool_counter = Counter()
+        company_size_counter = Counter()
+        industry_counter = Counter()
+        remote_count = 0
+        experience_total = 0
+        experience_n = 0
         
-        # 1. Roles from saved participants (weight: 2x)
         for p in saved_participants:
             if p.get('role'):
-                roles.append(p['role'])
-                roles.append(p['role'])  # Add twice for 2x weight
-        
-        # 2. Roles mentioned in search queries (weight: 1x, but more diverse)
-        role_keywords = {
-            'product manager': 'Product Manager',
-            'pm': 'Product Manager',
-            'ux designer': 'UX Designer',
-            'ux': 'UX Designer',
-            'product designer': 'Product Designer',
-            'software engineer': 'Software Engineer',
-            'engineer': 'Software Engineer',
-            'developer': 'Software Engineer',
-            'data scientist': 'Data Scientist',
-            'nurse': 'Nurse Practitioner',
-            'medical': 'Medical Director',
-            'healthcare': 'Healthcare Administrator',
-            'teacher': 'Academic Advisor',
-            'analyst': 'Business Analyst',
-            'accountant': 'Accountant',
-            'financial': 'Financial Analyst',
-            'marketing': 'Marketing Manager',
-            'sales': 'Sales Manager',
-            'manager': 'Operations Manager',
-        }
+                role_counter[p['role']] += 2  # saved profiles weigh 2x
+            if p.get('tools') and isinstance(p['tools'], list):
+                tool_counter.update(p['tools'])
+            if p.get('remote'):
+                remote_count += 1
+            if p.get('experience_years'):
+                experience_total += p['experience_years']
+                experience_n += 1
+            if p.get('company_size'):
+                company_size_counter[p['company_size']] += 1
+            if p.get('industry'):
+                industry_counter[p['industry']] += 1
         
+        # Roles mentioned in search queries (weight: 1x, but more diverse)
         for query in search_queries:
-            query_lower = query.lower()
-            for keyword, role in role_keywords.items():
-                if keyword in query_lower:
-                    roles.append(role)
+            role_counter.update(
+                _ROLE_KEYWORDS[match.group(1)]
+                for match in _ROLE_PATTERN.finditer(query.lower())
+            )
         
-        role_counter = Counter(roles)
         logger.info(f"🎭 Role analysis: {dict(role_counter.most_common(5))}")
         
-        # Count tools (flatten lists)
-        tools = []
-        for p in saved_participants:
-            if p.get('tools') and isinstance(p['tools'], list):
-                tools.extend(p['tools'])
-        tool_counter = Counter(tools)
-        
         # Analyze remote preference
-        remote_count = sum(1 for p in saved_participants if p.get('remote'))
         onsite_count = len(saved_participants) - remote_count
         remote_preference = None
         if len(saved_participants) > 0:
@@ -270,8 +348,7 @@ class RecommendationService:
                 remote_preference = "onsite"
         
         # Experience level preference
-        experience_levels = [p.get('experience_years', 0) for p in saved_participants if p.get('experience_years')]
-        avg_experience = sum(experience_levels) / len(experience_levels) if experience_levels else 0
+        avg_experience = experience_total / experience_n if experience_n else 0
         experience_preference = None
         if avg_experience >= 7:
             experience_preference = "7"
@@ -280,14 +357,6 @@ class RecommendationService:
         elif avg_experience >= 3:
             experience_preference = "3"
         
-        # Company size preference
-        company_sizes = [p.get('company_size') for p in saved_participants if p.get('company_size')]
-        company_size_counter = Counter(company_sizes)
-        
-        # Industry preference
-        industries = [p.get('industry') for p in saved_participants if p.get('industry')]
-        industry_counter = Counter(industries)
-        
         return {
             "top_roles": [role for role, _ in role_counter.most_common(3)],
             "top_tools": [tool for tool, _ in tool_counter.most_common(3)],
@@ -297,35 +366,36 @@ class RecommendationService:
             "top_industries": [ind for ind, _ in industry_counter.most_common(2)]
         }
     
-    def _generate_queries(self, patterns: Dict[str, Any], count: int = 8) -> List[str]:
+    def _generate_queries(
+        self,
+        patterns: Dict[str, Any],
+        count: int = 8,
+        user_id: str = ""
+    ) -> List[str]:
         """
         Generate search queries based on extracted patterns.
         
+        Output is a pure function of (user_id, patterns): variety comes
+        from a crc32(user_id) rotation instead of random.shuffle, so the
+        suggestion cache actually hits and the rotation is stable across
+        processes (unlike hash(), which varies with PYTHONHASHSEED).
+        
         Args:
             patterns: Patterns from _extract_patterns
             count: Number of queries to generate
+            user_id: User UUID, used to vary template order per user
             
         Returns:
-            List of generated query strings
+            List of generated query strings, guaranteed unique
         """
+        rotation = zlib.crc32(user_id.encode())
         queries = []
         
-        # Helper to map company size to readable format
-        def format_company_size(size: str) -> str:
-            size_map = {
-                "1-10": "startup",
-                "10-50": "small",
-                "50-200": "mid-size",
-                "200-500": "mid-size",
-                "500-1000": "large",
-                "1000+": "enterprise"
-            }
-            return size_map.get(size, "mid-size")
-        
         # Generate diverse queries - max 2 per role for variety
         template_options = ['remote', 'tool', 'experience', 'size', 'industry']
-        # Shuffle template order for variety
-        random.shuffle(template_options)
+        # Rotate template order per user for variety
+        rot = rotation % len(template_options)
+        template_options = template_options[rot:] + template_options[:rot]
         
         for idx, role in enumerate(patterns['top_roles'][:4]):  # Max 4 roles
             if not role:
@@ -345,7 +415,7 @@ class RecommendationService:
                 elif template_type == 'experience' and patterns.get('experience_preference'):
                     query = f"{role} with {patterns['experience_preference']}+ years experience"
                 elif template_type == 'size' and patterns.get('company_size_preference'):
-                    size = format_company_size(patterns['company_size_preference'][0])
+                    size = _format_company_size(patterns['company_size_preference'][0])
                     query = f"{role} at {size} companies"
                 elif template_type == 'industry' and patterns.get('top_industries'):
                     # Rotate through different industries
@@ -367,16 +437,19 @@ class RecommendationService:
             ]
             queries.extend(generic)
         
-        # Shuffle queries for variety on each request
-        random.shuffle(queries)
+        # Rotate queries per user for variety
+        if queries:
+            rot = rotation % len(queries)
+            queries = queries[rot:] + queries[:rot]
         
         final_queries = queries[:count]
-        logger.info(f"🎯 Generated {len(final_queries)} diverse queries from {len(patterns['top_roles'])} roles (shuffled for variety)")
+        logger.info(f"🎯 Generated {len(final_queries)} diverse queries from {len(patterns['top_roles'])} roles (rotated per user)")
         return final_queries
 
 
 # Global instance
 _recommendation_service = None
+_recommendation_service_lock = threading.Lock()
 
 def get_recommendation_service() -> RecommendationService:
     """
@@ -387,6 +460,8 @@ def get_recommendation_service() -> RecommendationService:
     """
     global _recommendation_service
     if _recommendation_service is None:
-        _recommendation_service = RecommendationService()
+        with _recommendation_service_lock:
+            if _recommendation_service is None:
+                _recommendation_service = RecommendationService()
     return _recommendation_service
 
@@ -6,18 +6,80 @@ This service coordinates the retrieval process and uses Hybrid Retrieval
 query preprocessing, filtering, and match explanations.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import gzip
 import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
 from datetime import datetime
 
+import orjson
+
+from config import settings
 from database import supabase
 from services.retrieval.hybrid_retriever import HybridRetriever
-from services.retrieval.prompt_interpreter import PromptInterpreter
+from services.retrieval.prompt_interpreter import get_prompt_interpreter
 from services.retrieval.query_processor import QueryProcessor
 from services.retrieval.relevance_explainer import RelevanceExplainer
 
 logger = logging.getLogger(__name__)
 
+# On-disk snapshot of the participants table so a pod restart only pays
+# for rows changed since the last boot instead of the full table.
+_SNAPSHOT_PATH = os.path.join(tempfile.gettempdir(), "recruitr_participants.pkl.gz")
+
+
+# Fields whose values repeat across most rows; interning them makes all
+# rows share one str object per distinct value instead of one per row
+_CATEGORICAL_FIELDS = ('role', 'industry', 'company_size', 'company_name')
+_CATEGORICAL_LIST_FIELDS = ('tools', 'skills')
+
+
+def _compact_participants(rows: List[Dict[str, Any]]) -> None:
+    """
+    Deduplicate categorical strings across participant rows in place.
+
+    JSON decoding allocates a fresh str per row even when 50k rows share
+    a few hundred distinct roles, industries, tools, and skills.
+    sys.intern collapses each distinct value to a single shared object,
+    which also turns later equality checks into pointer comparisons.
+    """
+    for p in rows:
+        for field in _CATEGORICAL_FIELDS:
+            value = p.get(field)
+            if isinstance(value, str):
+                p[field] = sys.intern(value)
+        for field in _CATEGORICAL_LIST_FIELDS:
+            values = p.get(field)
+            if values:
+                p[field] = [
+                    sys.intern(v) if isinstance(v, str) else v for v in values
+                ]
+
+
+def _fetch_rows(builder) -> List[Dict[str, Any]]:
+    """
+    Execute a PostgREST select, decoding the body with orjson.
+
+    The participants payload runs to megabytes (embeddings included)
+    and the client's default execute() parses it with stdlib json.
+    Issuing the request through the builder's own session and decoding
+    the raw bytes with orjson cuts the parse cost several-fold. Falls
+    back to execute() if the client internals ever change shape.
+    """
+    try:
+        response = builder.session.request(
+            "GET", builder.path, params=builder.params, headers=builder.headers
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    except AttributeError:
+        return builder.execute().data
+
 
 class SearchService:
     """
@@ -30,23 +92,84 @@ class SearchService:
     def __init__(self):
         """Initialize search service with all components."""
         self.participants = None
+        self._participants_by_id = None
         self.hybrid_retriever = None
-        self.prompt_interpreter = PromptInterpreter()
+        self.prompt_interpreter = get_prompt_interpreter()
         self.query_processor = QueryProcessor()
         self.relevance_explainer = RelevanceExplainer()
         self._load_participants()
         self._initialize_retrievers()
     
-    def _load_participants(self):
-        """Load all participants from database."""
+    def _load_participants(self, force_full: bool = False):
+        """
+        Load all participants, using the disk snapshot when possible.
+
+        A full select("*") ships every row (embeddings included) over
+        HTTP on each cold start. When a snapshot from a previous boot
+        exists, only rows with updated_at past the snapshot's high-water
+        mark are fetched and merged in. Deletes are not visible to the
+        delta query, so reload_data() forces a full fetch.
+
+        Args:
+            force_full: Skip the snapshot and pull the whole table
+        """
         logger.info("Loading participants from database...")
         try:
-            response = supabase.table("participants").select("*").execute()
-            self.participants = response.data
-            logger.info(f"Loaded {len(self.participants)} participants")
+            cached = None if force_full else self._read_snapshot()
+            if cached:
+                max_ts = max(p['updated_at'] for p in cached if p.get('updated_at'))
+                changed = _fetch_rows(
+                    supabase.table("participants")
+                    .select("*")
+                    .gt("updated_at", max_ts)
+                )
+                by_id = {p['id']: p for p in cached}
+                by_id.update((p['id'], p) for p in changed)
+                self.participants = list(by_id.values())
+                self._participants_by_id = by_id
+                logger.info(
+                    f"Loaded {len(self.participants)} participants "
+                    f"({len(changed)} changed since snapshot)"
+                )
+            else:
+                self.participants = _fetch_rows(
+                    supabase.table("participants").select("*")
+                )
+                # Hash lookup for enrichment; rebuilt automatically when
+                # reload_data() re-runs this loader
+                self._participants_by_id = {p['id']: p for p in self.participants}
+                logger.info(f"Loaded {len(self.participants)} participants")
+            _compact_participants(self.participants)
+            self._write_snapshot()
         except Exception as e:
             logger.error(f"Failed to load participants: {e}")
             raise
+
+    @staticmethod
+    def _read_snapshot() -> Optional[List[Dict[str, Any]]]:
+        """Return the snapshot rows, or None when absent/disabled/corrupt."""
+        if not settings.participants_snapshot:
+            return None
+        try:
+            with gzip.open(_SNAPSHOT_PATH, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable participant snapshot: {e}")
+            return None
+
+    def _write_snapshot(self):
+        """Persist the loaded rows for the next cold start (best-effort)."""
+        if not settings.participants_snapshot:
+            return
+        try:
+            tmp_path = f"{_SNAPSHOT_PATH}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+                pickle.dump(self.participants, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, _SNAPSHOT_PATH)
+        except Exception as e:
+            logger.warning(f"Failed to write participant snapshot: {e}")
     
     def _initialize_retrievers(self):
         """Initialize retrieval methods."""
@@ -62,25 +185,33 @@ class SearchService:
         self,
         query: str,
         top_k: int = 50,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        explain: bool = True
     ) -> Dict[str, Any]:
         """
         Search for participants matching the query with natural language understanding.
-        
+
         Pipeline:
         1. Extract structured filters from natural language query
         2. Preprocess query (normalize, expand synonyms)
         3. Merge explicit and extracted filters
         4. Execute hybrid search with filters
         5. Enrich results with match explanations
-        
+
         Args:
             query: Natural language search query
-            top_k: Number of results to return
+            top_k: Number of candidates to retrieve
             filters: Optional explicit filters (role, remote, tools, etc.)
-        
+            offset: Skip this many candidates before enriching (pagination)
+            limit: Enrich and return at most this many results; None for all
+            explain: Generate per-result match_reasons; pass False for
+                callers that render snippets lazily and don't need them
+
         Returns:
-            Dict with results and metadata including match_reasons
+            Dict with results and metadata including match_reasons;
+            `count` is the total number of candidates before slicing.
         """
         start_time = datetime.now()
         
@@ -98,8 +229,11 @@ class SearchService:
             query_terms = processed_query.get("terms", [])
             
             # Step 3: Merge explicit filters with extracted filters
-            # Explicit filters take precedence
-            merged_filters = {**extracted_filters, **(filters or {})}
+            # Explicit filters take precedence; update in place rather
+            # than allocating a throwaway dict per merge
+            merged_filters = dict(extracted_filters)
+            if filters:
+                merged_filters.update(filters)
             
             logger.debug(f"Extracted filters: {extracted_filters}")
             logger.debug(f"Merged filters: {merged_filters}")
@@ -109,28 +243,37 @@ class SearchService:
             results = self.hybrid_retriever.search(
                 query=expanded_query,
                 top_k=top_k,
-                filters=merged_filters if merged_filters else None
+                filters=merged_filters or None
             )
             
+            # Slice the requested page before enrichment so match
+            # explanations are only generated for rows the caller will
+            # actually return.
+            total_hits = len(results)
+            if offset or limit is not None:
+                end = offset + limit if limit is not None else None
+                results = results[offset:end]
+
             # Step 5: Enrich results with full participant data and match explanations
             enriched_results = self._enrich_results(
                 results,
                 method="Hybrid",
                 original_query=query,
                 filters=merged_filters,
-                query_terms=query_terms
+                query_terms=query_terms,
+                explain=explain
             )
-            
+
             # Calculate retrieval time
             retrieval_time = (datetime.now() - start_time).total_seconds() * 1000
-            
+
             logger.info(f"Search completed: {len(enriched_results)} results in {retrieval_time:.0f}ms")
-            
+
             return {
                 "query": query,
                 "expanded_query": expanded_query,
                 "results": enriched_results,
-                "count": len(enriched_results),
+                "count": total_hits,
                 "retrieval_time_ms": round(retrieval_time, 2),
                 "method": "hybrid",
                 "filters": merged_filters,
@@ -141,13 +284,87 @@ class SearchService:
             logger.error(f"Search failed: {e}")
             raise
     
+    async def search_stream(
+        self,
+        query: str,
+        top_k: int = 50,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 20
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Two-phase search: fast lexical results first, fused list after.
+
+        Yields a "partial" event with enriched BM25 results as soon as
+        the lexical leg finishes (typically tens of ms), then runs the
+        SBERT leg and yields a "final" event with the full RRF fusion.
+        Suitable for a StreamingResponse at the API layer; the blocking
+        search() stays as the single-response path.
+
+        Args:
+            query: Natural language search query
+            top_k: Number of candidates each leg retrieves
+            filters: Optional explicit filters
+            limit: Enrich and emit at most this many results per event
+
+        Yields:
+            {"type": "partial", "results": [...], "count": int} then
+            {"type": "final", "results": [...], "count": int}
+        """
+        interpreted_query = self.prompt_interpreter.extract_intent(query)
+        extracted_filters = interpreted_query.get("filters", {})
+        search_query = interpreted_query.get("query", query)
+
+        processed_query = self.query_processor.process_query(search_query)
+        expanded_query = processed_query.get("expanded_query", search_query)
+        query_terms = processed_query.get("terms", [])
+
+        merged_filters = dict(extracted_filters)
+        if filters:
+            merged_filters.update(filters)
+        merged_filters = merged_filters or None
+
+        retriever = self.hybrid_retriever
+        bm25_results = await asyncio.to_thread(
+            retriever.bm25.search, expanded_query, top_k * 2, merged_filters
+        )
+        yield {
+            "type": "partial",
+            "results": self._enrich_results(
+                bm25_results[:limit],
+                method="BM25",
+                original_query=query,
+                filters=merged_filters,
+                query_terms=query_terms,
+            ),
+            "count": len(bm25_results),
+        }
+
+        sbert_results = await asyncio.to_thread(
+            retriever.sbert.search, expanded_query, top_k * 2, merged_filters
+        )
+        fused = retriever.reciprocal_rank_fusion(
+            bm25_results, sbert_results, k=settings.rrf_k, top_k=top_k
+        )
+        yield {
+            "type": "final",
+            "results": self._enrich_results(
+                fused[:limit],
+                method="Hybrid",
+                original_query=query,
+                filters=merged_filters,
+                query_terms=query_terms,
+            ),
+            "count": len(fused),
+        }
+
     def _enrich_results(
         self,
         results: List[Dict[str, Any]],
         method: str,
         original_query: Optional[str] = None,
         filters: Optional[Dict[str, Any]] = None,
-        query_terms: Optional[List[str]] = None
+        query_terms: Optional[List[str]] = None,
+        explain: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Enrich results with full participant data and match explanations.
@@ -158,6 +375,7 @@ class SearchService:
             original_query: Original search query (for explanations)
             filters: Applied filters (for explanations)
             query_terms: Extracted query terms (for explanations)
+            explain: Skip explanation generation entirely when False
         
         Returns:
             List of enriched results with full participant data and match_reasons
@@ -166,15 +384,12 @@ class SearchService:
         
         for result in results:
             # Find full participant data
-            participant = next(
-                (p for p in self.participants if p['id'] == result['participant_id']),
-                None
-            )
+            participant = self._participants_by_id.get(result['participant_id'])
             
             if participant:
                 # Generate match explanations
                 match_reasons = []
-                if original_query:
+                if explain and original_query:
                     match_reasons = self.relevance_explainer.explain_match(
                         participant,
                         original_query,
@@ -215,10 +430,11 @@ class SearchService:
         """
         Reload participants from database and reinitialize retrievers.
         
-        Useful when data changes or for testing.
+        Useful when data changes or for testing. Always does a full
+        fetch so deleted rows drop out of the snapshot too.
         """
         logger.info("Reloading search service...")
-        self._load_participants()
+        self._load_participants(force_full=True)
         self._initialize_retrievers()
         logger.info("✅ Search service reloaded")
 
@@ -226,15 +442,27 @@ class SearchService:
 # Global search service instance
 # Initialized once when the app starts
 _search_service = None
+_search_service_lock = threading.Lock()
 
 def get_search_service() -> SearchService:
     """
     Get or create the global search service instance.
     
+    Double-checked locking: construction does a full participant load
+    plus BM25/SBERT index builds, so concurrent first requests must not
+    each run it.
+    
     Returns:
         SearchService instance
     """
     global _search_service
     if _search_service is None:
-        _search_service = SearchService()
+        with _search_service_lock:
+            if _search_service is None:
+                _search_service = SearchService()
     return _search_service
+
+
+def warmup() -> None:
+    """Build the search service eagerly (called from app startup)."""
+    get_search_service()
@@ -12,7 +12,7 @@ from .hybrid_retriever import HybridRetriever
 
 __all__ = [
     "BaseRetriever",
-    "BM25Retriever", 
+    "BM25Retriever",
     "SBERTRetriever",
     "HybridRetriever"
 ]
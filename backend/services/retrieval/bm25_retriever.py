@@ -6,21 +6,50 @@ Good for: exact term matching, tool names, specific keywords.
 
 References:
 - BM25 Algorithm: https://en.wikipedia.org/wiki/Okapi_BM25
-- rank-bm25 library: https://github.com/dorianbrown/rank_bm25
 """
 
-from rank_bm25 import BM25Okapi
-from typing import List, Dict, Any
+import math
+from typing import List, Dict, Any, Optional
+import gzip
+import hashlib
+import logging
+import os
+import pickle
+import re
+import tempfile
 import nltk
-from nltk.tokenize import word_tokenize
+import numpy as np
 from nltk.corpus import stopwords
-import logging
 
+from config import settings
 from .base_retriever import BaseRetriever
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# On-disk snapshot of the built index so warm restarts skip the
+# per-document word_tokenize pass, which dominates cold-start time.
+_INDEX_SNAPSHOT_PATH = os.path.join(tempfile.gettempdir(), "recruitr_bm25_index.pkl.gz")
+
+# Profile text needs nothing beyond alphanumeric runs; a precompiled
+# regex is an order of magnitude faster than NLTK's Punkt tokenizer.
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+
+# Bumped whenever tokenization or the index layout changes so stale
+# snapshots from a previous scheme are rebuilt instead of loaded.
+_INDEX_VERSION = 4
+
+# BM25F field weights. Weighting happens in the term-frequency and
+# document-length accumulation, not by repeating tokens in the text,
+# so the index stores each token once at its true frequency.
+_FIELD_WEIGHTS = {
+    'role': 3.0,
+    'tools': 2.0,
+    'skills': 1.5,
+    'company': 1.0,
+    'description': 0.5,
+}
+
 
 class BM25Retriever(BaseRetriever):
     """
@@ -31,9 +60,8 @@ class BM25Retriever(BaseRetriever):
     
     Attributes:
         participants: List of participant dictionaries from database
-        corpus: List of searchable text documents (one per participant)
-        tokenized_corpus: Tokenized version of corpus for BM25
-        bm25: BM25Okapi instance for scoring
+        doc_len: Field-weighted document lengths (BM25F)
+        postings: Per-term (doc indices, term frequencies, idf) arrays
         stop_words: Set of common words to filter out
     """
     
@@ -65,110 +93,266 @@ class BM25Retriever(BaseRetriever):
         # Download NLTK data if needed
         self._ensure_nltk_data()
         
-        # Get stopwords if filtering
-        self.stop_words = set(stopwords.words('english')) if remove_stopwords else set()
-        
-        # Build the search index
-        logger.info(f"Building BM25 index for {len(participants)} participants...")
-        self.corpus = self._build_corpus()
-        self.tokenized_corpus = self._tokenize_corpus()
-        self.bm25 = BM25Okapi(self.tokenized_corpus)
-        logger.info("BM25 index built successfully")
+        # Get stopwords if filtering (frozen for cheap membership tests)
+        self.stop_words = frozenset(stopwords.words('english')) if remove_stopwords else frozenset()
+        
+        # Build the search index, or reload it from the snapshot a
+        # previous process wrote when the corpus is unchanged
+        self.participants_by_id = {p['id']: p for p in participants}
+        self._build_filter_index()
+        fingerprint = self._corpus_fingerprint()
+        cached = self._read_index_snapshot(fingerprint)
+        if cached is not None:
+            self.weighted_tf, self.doc_len = cached
+            self._build_index()
+            logger.info(f"BM25 index loaded from snapshot ({len(participants)} participants)")
+        else:
+            logger.info(f"Building BM25 index for {len(participants)} participants...")
+            self._build_weighted_tf()
+            self._build_index()
+            self._write_index_snapshot(fingerprint)
+            logger.info("BM25 index built successfully")
+        # The per-document term maps duplicate everything the postings
+        # arrays hold; release them so steady-state memory is just the
+        # packed int32/float32 arrays plus the vocabulary keys.
+        self.weighted_tf = None
     
+    def _corpus_fingerprint(self) -> str:
+        """
+        Hash of everything the index depends on.
+
+        Covers row identity, row freshness (updated_at), row order (BM25
+        doc indices map positionally back to self.participants), and the
+        tokenization/scoring parameters.
+        """
+        h = hashlib.sha256(
+            f"{_INDEX_VERSION}:{self.k1}:{self.b}:{self.remove_stopwords}".encode()
+        )
+        for p in self.participants:
+            h.update(f"{p['id']}:{p.get('updated_at', '')};".encode())
+        return h.hexdigest()
+
+    def _build_index(self):
+        """
+        Build inverted-index arrays for vectorized BM25 scoring.
+
+        rank_bm25 scores document-by-document in Python; here each term
+        gets a postings entry of (doc indices, term frequencies, idf) as
+        NumPy arrays, so a query scores one vectorized gather-accumulate
+        per term instead of a Python loop over every document. Term
+        frequencies and document lengths carry the BM25F field weights.
+        The length normalization k1*(1 - b + b*dl/avgdl) is
+        query-independent and precomputed per document.
+        """
+        n = len(self.weighted_tf)
+        avgdl = self.doc_len.mean() if n else 1.0
+        self._norm = self.k1 * (1 - self.b + self.b * self.doc_len / avgdl)
+
+        postings_docs: Dict[str, List[int]] = {}
+        postings_tf: Dict[str, List[float]] = {}
+        for i, wtf in enumerate(self.weighted_tf):
+            for term, tf in wtf.items():
+                postings_docs.setdefault(term, []).append(i)
+                postings_tf.setdefault(term, []).append(tf)
+
+        # Partial evaluation: idf and (k1+1) are constant per term, so
+        # the whole numerator idf*(k1+1)*tf is folded into the index and
+        # the query loop is left with one divide and one add per posting
+        self.postings = {}
+        k1_plus_1 = self.k1 + 1
+        for term, docs in postings_docs.items():
+            df = len(docs)
+            idf = math.log((n - df + 0.5) / (df + 0.5) + 1)
+            tf = np.asarray(postings_tf[term], dtype=np.float32)
+            self.postings[term] = (
+                np.asarray(docs, dtype=np.int32),
+                tf,
+                (idf * k1_plus_1 * tf).astype(np.float32),
+            )
+
+    def _build_filter_index(self):
+        """
+        Precompute per-field columns used to mask scores by filters.
+
+        Filtering used to happen after scoring and sorting, walking the
+        surviving hits in Python. With one column per filterable field,
+        a filter set reduces to NumPy comparisons producing a boolean
+        candidate mask that zeroes ineligible scores before selection.
+        """
+        ps = self.participants
+        n = len(ps)
+        self._remote_col = np.fromiter(
+            (bool(p.get('remote')) for p in ps), dtype=bool, count=n
+        )
+        self._team_size_col = np.fromiter(
+            (p.get('team_size') or 0 for p in ps), dtype=np.int32, count=n
+        )
+        self._experience_col = np.fromiter(
+            (p.get('experience_years') or 0 for p in ps), dtype=np.int32, count=n
+        )
+        self._role_col = [(p.get('role') or '').lower() for p in ps]
+        self._tools_col = [
+            frozenset(t.lower() for t in p.get('tools') or ()) for p in ps
+        ]
+        self._company_size_col = [p.get('company_size') for p in ps]
+
+    def filter_mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Boolean mask of participants matching every filter."""
+        n = len(self.participants)
+        mask = np.ones(n, dtype=bool)
+
+        if 'remote' in filters:
+            mask &= self._remote_col == bool(filters['remote'])
+
+        if filters.get('tools'):
+            required = frozenset(t.lower() for t in filters['tools'])
+            mask &= np.fromiter(
+                (required <= tools for tools in self._tools_col),
+                dtype=bool, count=n
+            )
+
+        if filters.get('role'):
+            # Case-insensitive partial match in either direction
+            filter_role = filters['role'].lower()
+            mask &= np.fromiter(
+                (filter_role in role or role in filter_role for role in self._role_col),
+                dtype=bool, count=n
+            )
+
+        if 'min_team_size' in filters:
+            mask &= self._team_size_col >= filters['min_team_size']
+        if 'max_team_size' in filters:
+            mask &= self._team_size_col <= filters['max_team_size']
+
+        if filters.get('company_size'):
+            allowed = filters['company_size']
+            mask &= np.fromiter(
+                (size in allowed for size in self._company_size_col),
+                dtype=bool, count=n
+            )
+
+        if 'min_experience_years' in filters:
+            mask &= self._experience_col >= filters['min_experience_years']
+        if 'max_experience_years' in filters:
+            mask &= self._experience_col <= filters['max_experience_years']
+
+        return mask
+
+    def _get_scores(self, tokenized_query: List[str]) -> np.ndarray:
+        """BM25 scores for every document against the tokenized query."""
+        scores = np.zeros(self.doc_len.size, dtype=np.float32)
+        for term in tokenized_query:
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            docs, tf, numerator = entry
+            scores[docs] += numerator / (tf + self._norm[docs])
+        return scores
+
+    @staticmethod
+    def _read_index_snapshot(fingerprint: str) -> Optional[tuple]:
+        """Return (weighted_tf, doc_len) on a fingerprint match."""
+        if not settings.participants_snapshot:
+            return None
+        try:
+            with gzip.open(_INDEX_SNAPSHOT_PATH, 'rb') as f:
+                snapshot = pickle.load(f)
+            if snapshot.get('fingerprint') != fingerprint:
+                return None
+            return snapshot['weighted_tf'], snapshot['doc_len']
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable BM25 index snapshot: {e}")
+            return None
+
+    def _write_index_snapshot(self, fingerprint: str):
+        """Persist the built index for the next cold start (best-effort)."""
+        if not settings.participants_snapshot:
+            return
+        try:
+            tmp_path = f"{_INDEX_SNAPSHOT_PATH}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+                pickle.dump(
+                    {
+                        'fingerprint': fingerprint,
+                        'weighted_tf': self.weighted_tf,
+                        'doc_len': self.doc_len,
+                    },
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, _INDEX_SNAPSHOT_PATH)
+        except Exception as e:
+            logger.warning(f"Failed to write BM25 index snapshot: {e}")
+
     def _ensure_nltk_data(self):
         """Download required NLTK data if not present."""
         try:
-            nltk.data.find('tokenizers/punkt')
             nltk.data.find('corpora/stopwords')
         except LookupError:
             logger.info("Downloading NLTK data...")
-            nltk.download('punkt', quiet=True)
             nltk.download('stopwords', quiet=True)
     
-    def _build_corpus(self) -> List[str]:
+    def _create_document(self, participant: Dict[str, Any]) -> Dict[str, str]:
         """
-        Build searchable documents from participant data.
+        Split a participant into the text fields BM25F weights.
         
-        Combines relevant fields into a single searchable text string.
-        
-        Returns:
-            List of document strings (one per participant)
-        """
-        corpus = []
-        for participant in self.participants:
-            doc = self._create_document(participant)
-            corpus.append(doc)
-        return corpus
-    
-    def _create_document(self, participant: Dict[str, Any]) -> str:
-        """
-        Create a searchable document from a single participant with field weighting.
-        
-        Combines: role, industry, company, tools, skills, description
-        
-        Field weights (by repetition):
-        - Role: 3x (most important)
-        - Tools: 2x (very important)
-        - Skills: 1.5x (important)
-        - Company/Industry: 1x (normal)
-        - Description: 0.5x (less important)
+        Fields and weights (_FIELD_WEIGHTS):
+        - role: 3x (most important)
+        - tools: 2x (very important)
+        - skills: 1.5x (important)
+        - company (industry, company name, work type): 1x (normal)
+        - description: 0.5x (less important)
         
         Args:
             participant: Participant dictionary
             
         Returns:
-            Searchable text document with weighted fields
+            Mapping of field name to that field's searchable text
         """
-        parts = []
-        
-        # Add role (3x weight - most important)
-        if participant.get('role'):
-            parts.extend([participant['role']] * 3)
-        
-        # Add industry and company (1x weight)
+        company_parts = []
         if participant.get('industry'):
-            parts.append(participant['industry'])
+            company_parts.append(participant['industry'])
         if participant.get('company_name'):
-            parts.append(participant['company_name'])
-        
-        # Add work type (1x weight)
-        if participant.get('remote'):
-            parts.append('remote')
-        else:
-            parts.append('onsite office')
-        
-        # Add tools (2x weight - very important for matching)
-        if participant.get('tools'):
-            parts.extend(participant['tools'] * 2)
-        
-        # Add skills (1.5x weight - important)
-        if participant.get('skills'):
-            skills = participant['skills']
-            parts.extend(skills)
-            # Add half of skills again for 1.5x total weight
-            parts.extend(skills[:len(skills)//2 + 1])
-        
-        # Add description (0.5x weight - less important, naturally weighted lower due to length)
-        if participant.get('description'):
-            parts.append(participant['description'])
-        
-        # Combine into single document
-        return ' '.join(str(part) for part in parts)
+            company_parts.append(participant['company_name'])
+        company_parts.append('remote' if participant.get('remote') else 'onsite office')
+        
+        return {
+            'role': participant.get('role') or '',
+            'tools': ' '.join(participant.get('tools') or ()),
+            'skills': ' '.join(participant.get('skills') or ()),
+            'company': ' '.join(company_parts),
+            'description': participant.get('description') or '',
+        }
     
-    def _tokenize_corpus(self) -> List[List[str]]:
+    def _build_weighted_tf(self):
         """
-        Tokenize all documents in the corpus.
-        
-        Converts text into lowercase tokens, optionally removing stopwords.
-        
-        Returns:
-            List of token lists (one per document)
+        Accumulate field-weighted term frequencies per document.
+        
+        The old index repeated role tokens 3x and tool tokens 2x in the
+        document text, which inflated tokenization time, vocabulary
+        churn, and the length normalization. BM25F folds the weight into
+        the counts instead: a term in a weight-w field adds w to its
+        frequency, and w per token to the document length, so each token
+        is tokenized and stored exactly once.
         """
-        tokenized = []
-        for doc in self.corpus:
-            tokens = self._tokenize_text(doc)
-            tokenized.append(tokens)
-        return tokenized
+        self.weighted_tf = []
+        doc_lens = []
+        for participant in self.participants:
+            weighted = {}
+            length = 0.0
+            for field, text in self._create_document(participant).items():
+                if not text:
+                    continue
+                tokens = self._tokenize_text(text)
+                weight = _FIELD_WEIGHTS[field]
+                length += weight * len(tokens)
+                for token in tokens:
+                    weighted[token] = weighted.get(token, 0.0) + weight
+            self.weighted_tf.append(weighted)
+            doc_lens.append(length)
+        self.doc_len = np.asarray(doc_lens, dtype=np.float32)
     
     def _tokenize_text(self, text: str) -> List[str]:
         """
@@ -180,12 +364,12 @@ class BM25Retriever(BaseRetriever):
         Returns:
             List of lowercase tokens
         """
-        # Tokenize and lowercase
-        tokens = word_tokenize(text.lower())
+        # Alphanumeric runs only, so no isalnum() re-check is needed
+        tokens = _TOKEN_RE.findall(text.lower())
         
         # Remove stopwords if configured
         if self.remove_stopwords:
-            tokens = [t for t in tokens if t not in self.stop_words and t.isalnum()]
+            tokens = [t for t in tokens if t not in self.stop_words]
         
         return tokens
     
@@ -224,130 +408,41 @@ class BM25Retriever(BaseRetriever):
         tokenized_query = self._tokenize_text(query)
         
         # Get BM25 scores for all documents
-        scores = self.bm25.get_scores(tokenized_query)
-        
-        # Combine with participant IDs and sort
-        results = []
-        for i, score in enumerate(scores):
-            if score > 0:  # Only include documents with non-zero scores
-                results.append({
-                    "participant_id": self.participants[i]['id'],
-                    "score": float(score),
-                    "rank": 0  # Will be set later
-                })
-        
-        # Sort by score (descending)
-        results.sort(key=lambda x: x['score'], reverse=True)
-        
-        # Apply filters if provided
+        scores = self._get_scores(tokenized_query)
+
+        # Zero out ineligible participants before selection so sorting
+        # and materialization only ever see candidates
         if filters:
-            results = self._apply_filters(results, filters)
-        
-        # Add ranks and limit to top_k
-        for rank, result in enumerate(results[:top_k], start=1):
-            result['rank'] = rank
-        
+            scores[~self.filter_mask(filters)] = 0.0
+
+        # Partial selection of the top_k is O(N); only the kept slice is
+        # fully sorted. Zero scores mean no match (or filtered out).
+        n = scores.size
+        if top_k < n:
+            top_idx = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            top_idx = np.arange(n)
+        top_idx = top_idx[np.argsort(-scores[top_idx])]
+
+        top_results = []
+        for i in top_idx:
+            score = scores[i]
+            if score <= 0:
+                break  # descending order: everything after is zero too
+            top_results.append({
+                "participant_id": self.participants[i]['id'],
+                "score": float(score),
+                "rank": len(top_results) + 1
+            })
+
         # Log results (handle empty results case)
-        top_results = results[:top_k]
         if top_results:
             logger.info(f"BM25 returned {len(top_results)} results (top score: {top_results[0]['score']:.2f})")
         else:
             logger.info("BM25 returned 0 results (no matches found)")
-        
+
         return top_results
     
-    def _apply_filters(self, results: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """
-        Apply post-retrieval filters to results.
-        
-        Args:
-            results: List of search results with participant_id
-            filters: Dictionary of filter criteria
-            
-        Returns:
-            Filtered list of results
-        """
-        # Create a mapping of participant_id to participant data for quick lookup
-        participants_dict = {p['id']: p for p in self.participants}
-        
-        filtered_results = []
-        for result in results:
-            participant = participants_dict.get(result['participant_id'])
-            if not participant:
-                continue
-            
-            # Apply each filter
-            if not self._matches_filters(participant, filters):
-                continue
-            
-            filtered_results.append(result)
-        
-        return filtered_results
-    
-    def _matches_filters(self, participant: Dict[str, Any], filters: Dict[str, Any]) -> bool:
-        """
-        Check if a participant matches all filter criteria.
-        
-        Args:
-            participant: Participant dictionary
-            filters: Filter criteria
-            
-        Returns:
-            True if participant matches all filters
-        """
-        # Remote filter
-        if 'remote' in filters:
-            if participant.get('remote') != filters['remote']:
-                return False
-        
-        # Tools filter (participant must have all required tools)
-        if 'tools' in filters and filters['tools']:
-            participant_tools = participant.get('tools', [])
-            if not participant_tools:
-                return False
-            # Check if participant has all required tools (case-insensitive)
-            participant_tools_lower = [t.lower() for t in participant_tools]
-            for required_tool in filters['tools']:
-                if required_tool.lower() not in participant_tools_lower:
-                    return False
-        
-        # Role filter (case-insensitive partial match)
-        if 'role' in filters and filters['role']:
-            participant_role = participant.get('role', '').lower()
-            filter_role = filters['role'].lower()
-            if filter_role not in participant_role and participant_role not in filter_role:
-                return False
-        
-        # Team size filter
-        if 'min_team_size' in filters:
-            team_size = participant.get('team_size', 0)
-            if team_size < filters['min_team_size']:
-                return False
-        
-        if 'max_team_size' in filters:
-            team_size = participant.get('team_size', 0)
-            if team_size > filters['max_team_size']:
-                return False
-        
-        # Company size filter
-        if 'company_size' in filters and filters['company_size']:
-            participant_size = participant.get('company_size')
-            if participant_size not in filters['company_size']:
-                return False
-        
-        # Experience years filter
-        if 'min_experience_years' in filters:
-            experience = participant.get('experience_years', 0)
-            if experience < filters['min_experience_years']:
-                return False
-        
-        if 'max_experience_years' in filters:
-            experience = participant.get('experience_years', 0)
-            if experience > filters['max_experience_years']:
-                return False
-        
-        return True
-    
     def get_name(self) -> str:
         """Return the name of this retriever."""
         return f"BM25 (k1={self.k1}, b={self.b})"
@@ -6,10 +6,15 @@ lexical (BM25) and semantic (SBERT) search results.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import orjson
 from typing import List, Dict, Any, Optional
 from .bm25_retriever import BM25Retriever
 from .sbert_retriever import SBERTRetriever
 from config import settings
+from utils import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +33,26 @@ class HybridRetriever:
         logger.info("Initializing Hybrid Retriever...")
         self.participants = participants
         self.bm25 = BM25Retriever(participants)
-        self.sbert = SBERTRetriever()
-        self.participants_dict = {p['id']: p for p in participants}
+        # SBERT scores locally against the stored embeddings and shares
+        # BM25's filter mask so both legs filter identically
+        self.sbert = SBERTRetriever(
+            participants=participants, filter_mask=self.bm25.filter_mask
+        )
+        # Share the index BM25 already built instead of allocating a second one
+        self.participants_dict = self.bm25.participants_by_id
+        # Positional index for the flat RRF accumulator
+        self.id_to_idx = {p['id']: i for i, p in enumerate(participants)}
+        self.idx_to_id = [p['id'] for p in participants]
+        # Fused results for repeated (query, filters, top_k) tuples; the
+        # corpus only changes via reload_data, which rebuilds this
+        # retriever (and so the cache) wholesale. TTL bounds staleness
+        # against out-of-band row edits between reloads.
+        self._result_cache = TTLCache(maxsize=1024, ttl=300.0)
+        # BM25 (CPU) and SBERT (model + pgvector RPC) are independent;
+        # two workers let each query run them side by side
+        self._executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="hybrid-retrieval"
+        )
         logger.info("✅ Hybrid Retriever initialized")
         
     def search(
@@ -51,25 +74,42 @@ class HybridRetriever:
         """
         logger.info(f"Hybrid search query: '{query}'")
         
-        # 1. Get BM25 results (get 2x top_k to allow for fusion overlaps)
-        # BM25 now supports post-retrieval filtering
-        bm25_results = self.bm25.search(query, top_k=top_k * 2, filters=filters)
-        
-        # 2. Get SBERT results
-        # SBERT supports filters natively in the DB query
+        # Filters canonicalize through sorted-key JSON so equivalent
+        # dicts share a cache entry regardless of insertion order
+        cache_key = (
+            query,
+            top_k,
+            orjson.dumps(filters, option=orjson.OPT_SORT_KEYS) if filters else None,
+        )
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Hybrid cache hit for query: '{query}'")
+            return [dict(r) for r in cached]
+
+        # 1+2. Run BM25 (score masking handles filters) and SBERT
+        # (filters natively in the DB query) concurrently - latency is
+        # max(bm25, sbert) instead of their sum. Both fetch 2x top_k to
+        # allow for fusion overlaps.
+        bm25_future = self._executor.submit(
+            self.bm25.search, query, top_k * 2, filters
+        )
         sbert_results = self.sbert.search(query, top_k=top_k * 2, filters=filters)
+        bm25_results = bm25_future.result()
         
-        # 3. Apply Reciprocal Rank Fusion
-        fused_results = self.reciprocal_rank_fusion(bm25_results, sbert_results, k=settings.rrf_k)
-        
-        # 4. Limit to top_k
-        return fused_results[:top_k]
+        # 3. Apply Reciprocal Rank Fusion, keeping only the top_k
+        final_results = self.reciprocal_rank_fusion(
+            bm25_results, sbert_results, k=settings.rrf_k, top_k=top_k
+        )
+        # Store copies so callers can't mutate the cached dicts
+        self._result_cache.set(cache_key, [dict(r) for r in final_results])
+        return final_results
     
     def reciprocal_rank_fusion(
         self,
         bm25_results: List[Dict[str, Any]],
         sbert_results: List[Dict[str, Any]],
-        k: int = 60
+        k: int = 60,
+        top_k: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Combine rankings using Reciprocal Rank Fusion.
@@ -81,39 +121,43 @@ class HybridRetriever:
             bm25_results: Results from BM25
             sbert_results: Results from SBERT
             k: RRF constant (default: 60)
+            top_k: Return only the best top_k entries; None for all
             
         Returns:
             List of participants sorted by fused score
         """
-        fused_scores = {}
-        
-        # Helper to process results
-        def process_results(results):
-            for rank, result in enumerate(results):
-                p_id = result['participant_id']
-                if p_id not in fused_scores:
-                    fused_scores[p_id] = 0.0
-                # Rank starts at 0, so we add 1 to match formula expectation (1-based rank)
-                fused_scores[p_id] += 1.0 / (k + rank + 1)
-        
-        # Process both lists
-        process_results(bm25_results)
-        process_results(sbert_results)
-        
-        # Create result list
-        results = []
-        for p_id, score in fused_scores.items():
-            results.append({
-                "participant_id": p_id,
-                "score": score,
-                "rank": 0  # Will be set below
+        # Flat accumulator indexed by participant position: each input
+        # list contributes its reciprocal ranks in one vectorized add
+        # instead of per-hit dict lookups
+        n = len(self.idx_to_id)
+        scores = np.zeros(n, dtype=np.float64)
+        for results in (bm25_results, sbert_results):
+            pairs = [
+                (self.id_to_idx[r['participant_id']], rank)
+                for rank, r in enumerate(results, start=1)
+                if r['participant_id'] in self.id_to_idx
+            ]
+            if pairs:
+                idx, ranks = (np.asarray(col) for col in zip(*pairs))
+                scores[idx] += 1.0 / (k + ranks)
+
+        # Partial selection: argpartition pulls the top_k in O(N), then
+        # only that slice is sorted for final ranking. Zero scores mean
+        # the participant appeared in neither list.
+        if top_k is not None and top_k < n:
+            top_idx = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            top_idx = np.arange(n)
+        top_idx = top_idx[np.argsort(-scores[top_idx])]
+
+        fused = []
+        for i in top_idx:
+            score = scores[i]
+            if score <= 0:
+                break  # descending order: everything after is zero too
+            fused.append({
+                "participant_id": self.idx_to_id[i],
+                "score": float(score),
+                "rank": len(fused) + 1
             })
-            
-        # Sort by score descending
-        results.sort(key=lambda x: x['score'], reverse=True)
-        
-        # Add final rank
-        for i, result in enumerate(results):
-            result['rank'] = i + 1
-            
-        return results
+        return fused
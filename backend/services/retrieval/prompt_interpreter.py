@@ -6,6 +6,7 @@ for remote work, tools, roles, team size, company size, and experience.
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 
@@ -72,6 +73,37 @@ class PromptInterpreter:
             "enterprise": ["500-1000", "1000+"],
         }
         
+        # Precompiled alternations: one scan per prompt instead of one
+        # re.search per keyword, with patterns compiled once here rather
+        # than on every call. Longest-first so "software engineer" wins
+        # over "engineer" when both start at the same position.
+        role_keys = sorted(self.role_mapping, key=len, reverse=True)
+        self._role_re = re.compile(
+            r'\b(' + '|'.join(re.escape(k) for k in role_keys) + r')\b'
+        )
+        remote_keywords = ["remote", "work from home", "wfh", "distributed", "telecommute"]
+        onsite_keywords = ["onsite", "on-site", "office", "in-person", "on site"]
+        self._remote_re = re.compile('|'.join(re.escape(k) for k in remote_keywords))
+        self._onsite_re = re.compile('|'.join(re.escape(k) for k in onsite_keywords))
+        # Tool names matched in one linear scan; longest-first so
+        # "microsoft teams" is found as itself, and the lowered match
+        # maps back to the properly-cased keyword
+        self._tool_by_lower = {t.lower(): t for t in self.tool_keywords}
+        tool_keys = sorted(self._tool_by_lower, key=len, reverse=True)
+        self._tool_re = re.compile('|'.join(re.escape(k) for k in tool_keys))
+        # Numeric range patterns, compiled once. Kept as separate
+        # patterns searched in priority order: folding them into one
+        # alternation would make the leftmost occurrence win instead of
+        # the most specific pattern (a range anywhere in the prompt must
+        # beat an earlier bare "N years").
+        self._team_range_re = re.compile(r'(\d+)\s*-\s*(\d+)\s*(people|team|reports|direct)')
+        self._team_to_re = re.compile(r'(\d+)\s+to\s+(\d+)\s*(people|team|reports)')
+        self._team_single_re = re.compile(r'(manage|lead|team of)\s+(\d+)')
+        self._exp_range_re = re.compile(r'(\d+)\s*-\s*(\d+)\s*years?')
+        self._exp_min_re = re.compile(r'(\d+)\s*\+?\s*(or more)?\s*years?')
+        self._company_range_re = re.compile(r'company.*?(\d+)\s*-\s*(\d+)')
+        self._company_size_re = re.compile('|'.join(re.escape(k) for k in self.company_size_patterns))
+        
     def extract_intent(self, prompt: str) -> Dict:
         """
         Extract structured filters from natural language prompt.
@@ -84,8 +116,26 @@ class PromptInterpreter:
                 - query: Original prompt (for semantic search)
                 - filters: Extracted structured filters
         """
-        prompt_lower = prompt.lower()
-        
+        return {
+            "query": prompt,
+            "filters": self._extract_filters(prompt.lower())
+        }
+
+    def extract_intent_batch(self, prompts: List[str]) -> List[Dict]:
+        """
+        Extract structured filters from many prompts in one call.
+
+        Eval runs and reindex jobs interpret thousands of stored prompts;
+        batching keeps the compiled-pattern extractors in one tight loop
+        instead of re-dispatching through extract_intent per prompt.
+        """
+        return [
+            {"query": prompt, "filters": self._extract_filters(prompt.lower())}
+            for prompt in prompts
+        ]
+
+    def _extract_filters(self, prompt_lower: str) -> Dict:
+        """Run all extractors against an already-lowered prompt."""
         filters = {}
         
         # Extract remote preference
@@ -94,7 +144,7 @@ class PromptInterpreter:
             filters["remote"] = remote
         
         # Extract tools
-        tools = self._extract_tools(prompt)
+        tools = self._extract_tools(prompt_lower)
         if tools:
             filters["tools"] = tools
         
@@ -122,18 +172,12 @@ class PromptInterpreter:
         if experience.get("max") is not None:
             filters["max_experience_years"] = experience["max"]
         
-        return {
-            "query": prompt,
-            "filters": filters
-        }
+        return filters
     
     def _extract_remote(self, prompt: str) -> Optional[bool]:
         """Extract remote/onsite preference."""
-        remote_keywords = ["remote", "work from home", "wfh", "distributed", "telecommute"]
-        onsite_keywords = ["onsite", "on-site", "office", "in-person", "on site"]
-        
-        has_remote = any(keyword in prompt for keyword in remote_keywords)
-        has_onsite = any(keyword in prompt for keyword in onsite_keywords)
+        has_remote = self._remote_re.search(prompt) is not None
+        has_onsite = self._onsite_re.search(prompt) is not None
         
         if has_remote and not has_onsite:
             return True
@@ -141,22 +185,17 @@ class PromptInterpreter:
             return False
         return None
     
-    def _extract_tools(self, prompt: str) -> List[str]:
+    def _extract_tools(self, prompt_lower: str) -> List[str]:
         """Extract mentioned tools (case-sensitive for proper nouns)."""
-        found_tools = []
-        for tool in self.tool_keywords:
-            if tool.lower() in prompt.lower():
-                found_tools.append(tool)
-        return found_tools
+        found = set(self._tool_re.findall(prompt_lower))
+        # Keyword-list order keeps the output stable across prompts
+        return [self._tool_by_lower[t] for t in self._tool_by_lower if t in found]
     
     def _extract_role(self, prompt: str) -> Optional[str]:
         """Extract role with abbreviation support."""
-        for keyword, role in self.role_mapping.items():
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            if re.search(pattern, prompt):
-                return role
-        return None
+        # Word boundaries in the alternation avoid partial matches
+        match = self._role_re.search(prompt)
+        return self.role_mapping[match.group(1)] if match else None
     
     def _extract_team_size(self, prompt: str) -> Dict[str, Optional[int]]:
         """
@@ -169,21 +208,21 @@ class PromptInterpreter:
         result = {"min": None, "max": None}
         
         # Pattern: "X-Y people/team/reports"
-        range_match = re.search(r'(\d+)\s*-\s*(\d+)\s*(people|team|reports|direct)', prompt)
+        range_match = self._team_range_re.search(prompt)
         if range_match:
             result["min"] = int(range_match.group(1))
             result["max"] = int(range_match.group(2))
             return result
         
         # Pattern: "X to Y people"
-        to_match = re.search(r'(\d+)\s+to\s+(\d+)\s*(people|team|reports)', prompt)
+        to_match = self._team_to_re.search(prompt)
         if to_match:
             result["min"] = int(to_match.group(1))
             result["max"] = int(to_match.group(2))
             return result
         
         # Pattern: "manage/lead X" or "team of X"
-        single_match = re.search(r'(manage|lead|team of)\s+(\d+)', prompt)
+        single_match = self._team_single_re.search(prompt)
         if single_match:
             size = int(single_match.group(2))
             result["min"] = size
@@ -194,12 +233,15 @@ class PromptInterpreter:
     
     def _extract_company_size(self, prompt: str) -> Optional[List[str]]:
         """Extract company size indicators."""
+        # One scan over the prompt, then resolve ties in dict order so
+        # "small" still wins over a later-listed keyword as before.
+        found = set(self._company_size_re.findall(prompt))
         for keyword, sizes in self.company_size_patterns.items():
-            if keyword in prompt:
+            if keyword in found:
                 return sizes
         
         # Also check for explicit size ranges like "50-200"
-        size_match = re.search(r'company.*?(\d+)\s*-\s*(\d+)', prompt)
+        size_match = self._company_range_re.search(prompt)
         if size_match:
             return [f"{size_match.group(1)}-{size_match.group(2)}"]
         
@@ -215,25 +257,30 @@ class PromptInterpreter:
         result = {"min": None, "max": None}
         
         # Pattern: "X-Y years"
-        range_match = re.search(r'(\d+)\s*-\s*(\d+)\s*years?', prompt)
+        range_match = self._exp_range_re.search(prompt)
         if range_match:
             result["min"] = int(range_match.group(1))
             result["max"] = int(range_match.group(2))
             return result
         
-        # Pattern: "X+ years" or "X or more years"
-        plus_match = re.search(r'(\d+)\s*\+?\s*(or more)?\s*years?', prompt)
+        # Pattern: "X+ years", "X or more years", or bare "X years".
+        # This also covers the old "with X years" fallback, which could
+        # never be reached because this pattern matches a superset.
+        plus_match = self._exp_min_re.search(prompt)
         if plus_match:
             result["min"] = int(plus_match.group(1))
             return result
         
-        # Pattern: "with X years"
-        with_match = re.search(r'with\s+(\d+)\s*years?', prompt)
-        if with_match:
-            years = int(with_match.group(1))
-            result["min"] = years
-            result["max"] = years
-            return result
-        
         return result
 
+
+@lru_cache(maxsize=1)
+def get_prompt_interpreter() -> PromptInterpreter:
+    """
+    Get the shared PromptInterpreter instance.
+
+    All instance state (keyword maps and compiled patterns) is read-only
+    after __init__, so one interpreter is safely shared across request
+    threads and the pattern-compilation cost is paid once per process.
+    """
+    return PromptInterpreter()
@@ -58,6 +58,20 @@ class QueryProcessor:
             "aws": "amazon web services",
             "gcp": "google cloud platform",
         }
+        
+        # One alternation over every synonym key, longest-first so
+        # "work from home" wins over "work" at the same position, with
+        # word boundaries standing in for whole-token matching. A single
+        # linear scan in the regex engine replaces the old sliding-window
+        # phrase loop.
+        syn_keys = sorted(self.synonym_map, key=len, reverse=True)
+        self._syn_re = re.compile(
+            r'\b(?:' + '|'.join(re.escape(k) for k in syn_keys) + r')\b'
+        )
+        
+        # Normalization patterns, compiled once.
+        self._punct_re = re.compile(r'[^\w\s\-]+')
+        self._ws_re = re.compile(r'\s+')
     
     def process_query(self, query: str) -> Dict[str, Any]:
         """
@@ -99,19 +113,11 @@ class QueryProcessor:
         Returns:
             Normalized text
         """
-        # Lowercase
-        text = text.lower()
-        
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        # Remove special punctuation but keep hyphens and underscores
-        text = re.sub(r'[^\w\s\-]', ' ', text)
-        
-        # Clean up extra spaces again
-        text = ' '.join(text.split())
-        
-        return text
+        # Strip punctuation (keeping hyphens and underscores), then
+        # collapse whitespace once; the old double split/join pass was
+        # redundant since punctuation removal is what introduces gaps.
+        text = self._punct_re.sub(' ', text.lower())
+        return self._ws_re.sub(' ', text).strip()
     
     def _expand_synonyms(self, text: str) -> str:
         """
@@ -123,35 +129,11 @@ class QueryProcessor:
         Returns:
             Text with synonyms expanded
         """
-        expanded_parts = []
-        words = text.split()
-        
-        i = 0
-        while i < len(words):
-            word = words[i]
-            
-            # Check for multi-word phrases (e.g., "work from home")
-            matched = False
-            for phrase_len in range(min(4, len(words) - i), 0, -1):
-                phrase = ' '.join(words[i:i+phrase_len])
-                if phrase in self.synonym_map:
-                    # Add both original and expanded
-                    expanded_parts.append(phrase)
-                    expanded_parts.append(self.synonym_map[phrase])
-                    i += phrase_len
-                    matched = True
-                    break
-            
-            if not matched:
-                # Check single word
-                if word in self.synonym_map:
-                    expanded_parts.append(word)
-                    expanded_parts.append(self.synonym_map[word])
-                else:
-                    expanded_parts.append(word)
-                i += 1
-        
-        return ' '.join(expanded_parts)
+        # Keep each matched phrase and splice its expansion in after it,
+        # matching what the old per-window loop emitted.
+        return self._syn_re.sub(
+            lambda m: m.group(0) + ' ' + self.synonym_map[m.group(0)], text
+        )
     
     def _extract_terms(self, text: str) -> List[str]:
         """
@@ -163,16 +145,7 @@ class QueryProcessor:
         Returns:
             List of terms
         """
-        # Split on whitespace and filter empty strings
-        terms = [term for term in text.split() if term]
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_terms = []
-        for term in terms:
-            if term not in seen:
-                seen.add(term)
-                unique_terms.append(term)
-        
-        return unique_terms
+        # dict.fromkeys dedups in C while preserving first-seen order;
+        # split() with no argument already drops empty strings.
+        return list(dict.fromkeys(text.split()))
 
@@ -39,6 +39,19 @@ class RelevanceExplainer:
             ["Role: Product Manager", "Uses Trello, Figma", "Remote worker", 
              "Skills: UX Design, Python", "5 years of experience"]
         """
+        terms_lower = [t.lower() for t in query_terms] if query_terms else None
+        return self._explain(participant, filters, terms_lower)
+
+    def _explain(
+        self,
+        participant: Dict[str, Any],
+        filters: Optional[Dict[str, Any]],
+        terms_lower: Optional[List[str]]
+    ) -> List[str]:
+        """Build match reasons from already-lowered query terms."""
+        # Exact-match lookups (tool names) go through a set; the list
+        # form stays for the substring scans over skills and locations
+        terms_set = frozenset(terms_lower) if terms_lower else None
         reasons = []
         
         # Role match
@@ -50,12 +63,13 @@ class RelevanceExplainer:
         if tools:
             # If filters specified tools, highlight those
             if filters and 'tools' in filters and filters['tools']:
-                matched_tools = [t for t in tools if t in filters['tools']]
+                filter_tools = set(filters['tools'])
+                matched_tools = [t for t in tools if t in filter_tools]
                 if matched_tools:
                     reasons.append(f"Uses {', '.join(matched_tools)}")
             # Otherwise check if any tools mentioned in query
-            elif query_terms:
-                matched_tools = [t for t in tools if t.lower() in [term.lower() for term in query_terms]]
+            elif terms_lower:
+                matched_tools = [t for t in tools if t.lower() in terms_set]
                 if matched_tools:
                     reasons.append(f"Uses {', '.join(matched_tools[:3])}")
             # Or just show some tools
@@ -68,9 +82,18 @@ class RelevanceExplainer:
         
         # Skills match
         skills = participant.get('skills', [])
-        if skills and query_terms:
-            # Find skills that match query terms
-            matched_skills = [s for s in skills if any(term.lower() in s.lower() for term in query_terms)]
+        if skills and terms_lower:
+            # Find skills that match query terms. A whole-word hit
+            # resolves through one set intersection; the substring scan
+            # only runs when no term equals a token of the skill, so
+            # prefix matches like "design" in "UX Designer" still work.
+            matched_skills = [
+                s for s in skills
+                if (low := s.lower()) and (
+                    terms_set & set(low.split())
+                    or any(term in low for term in terms_lower)
+                )
+            ]
             if matched_skills:
                 reasons.append(f"Skills: {', '.join(matched_skills[:3])}")
             elif len(skills) > 0:
@@ -81,7 +104,7 @@ class RelevanceExplainer:
         # Company match
         if participant.get('company_name'):
             # Check if company mentioned in query
-            if query_terms and any(term.lower() in participant['company_name'].lower() for term in query_terms):
+            if terms_lower and any(term in participant['company_name'].lower() for term in terms_lower):
                 reasons.append(f"Works at {participant['company_name']}")
         
         # Experience
@@ -102,9 +125,9 @@ class RelevanceExplainer:
                 reasons.append(f"Company size: {company_size}")
         
         # Location match (if mentioned in query)
-        if participant.get('location') and query_terms:
+        if participant.get('location') and terms_lower:
             location = participant['location']
-            if any(term.lower() in location.lower() for term in query_terms):
+            if any(term in location.lower() for term in terms_lower):
                 reasons.append(f"Location: {location}")
         
         # Limit to top 5 most relevant reasons
@@ -127,17 +150,15 @@ class RelevanceExplainer:
             query_terms: Query terms
             
         Returns:
-            Results with added 'match_reasons' field
+            The same result dicts with a 'match_reasons' field added
+            in place; no per-result copies are made
         """
-        enriched = []
+        # Lower the query terms once for the whole batch instead of once
+        # per participant inside explain_match
+        terms_lower = [t.lower() for t in query_terms] if query_terms else None
         for result in results:
-            participant = result.get('participant', {})
-            match_reasons = self.explain_match(
-                participant, original_query, filters, query_terms
+            result['match_reasons'] = self._explain(
+                result.get('participant', {}), filters, terms_lower
             )
-            enriched.append({
-                **result,
-                'match_reasons': match_reasons
-            })
-        return enriched
+        return results
 
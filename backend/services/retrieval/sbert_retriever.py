@@ -5,35 +5,174 @@ Implements semantic search using Sentence-BERT and Supabase pgvector.
 """
 
 import logging
-from typing import List, Dict, Any, Optional
-from sentence_transformers import SentenceTransformer
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import orjson
+
 from database import supabase
 from config import settings
+from services.embedder import get_embedder
+from utils import TTLCache
 from .base_retriever import BaseRetriever
 
 logger = logging.getLogger(__name__)
 
+
+class _PendingEncode:
+    """One queued query awaiting its embedding from the batch worker."""
+
+    __slots__ = ("text", "result", "error", "done")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class _EncodeBatcher:
+    """
+    Micro-batches concurrent query encodes into one SBERT forward pass.
+
+    Search requests run on worker threads, so a burst of queries would
+    each pay a separate forward pass. Callers enqueue their text and
+    block; a single worker drains the queue for up to max_wait seconds
+    (or max_batch items), sorts the batch by length so padding is
+    minimal, encodes it in one call, and fans the rows back out. A lone
+    query only ever waits for its own encode - the worker starts its
+    batch with whatever arrived first and the wait applies to extras.
+    """
+
+    def __init__(self, model, max_batch: int = 32, max_wait: float = 0.01):
+        self._model = model
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._queue: "queue.Queue[_PendingEncode]" = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def encode(self, text: str) -> List[float]:
+        """Encode text, sharing a forward pass with concurrent callers."""
+        item = _PendingEncode(text)
+        self._ensure_worker()
+        self._queue.put(item)
+        item.done.wait()
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="sbert-encode-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self._max_wait
+            while len(items) < self._max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            try:
+                # Length-sorted so same-batch sequences pad about equally
+                order = sorted(range(len(items)), key=lambda i: len(items[i].text))
+                embeddings = self._model.encode([items[i].text for i in order])
+                for row, i in enumerate(order):
+                    items[i].result = embeddings[row].tolist()
+            except Exception as e:
+                for item in items:
+                    item.error = e
+            finally:
+                for item in items:
+                    item.done.set()
+
+
 class SBERTRetriever(BaseRetriever):
     """
     Semantic search using Sentence-BERT embeddings and Supabase pgvector.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        participants: Optional[List[Dict[str, Any]]] = None,
+        filter_mask: Optional[Callable[[Dict[str, Any]], np.ndarray]] = None
+    ):
         """
         Initialize SBERT retriever.
+
+        Args:
+            participants: Rows whose stored embeddings become the local
+                document matrix; without them every search falls back to
+                the match_participants RPC
+            filter_mask: Callable turning a filters dict into a boolean
+                mask over the participants (shared with BM25 so the
+                local path filters like the RPC did)
         """
         self.model_name = settings.sbert_model
         self.model = None
+        # Query embeddings are pure functions of the query text, so hits
+        # skip the SBERT forward pass entirely
+        self._embedding_cache = TTLCache(maxsize=1000, ttl=3600.0)
         self._load_model()
+        self._batcher = _EncodeBatcher(self.model)
+        self._filter_mask = filter_mask
+        self._doc_ids: List[str] = []
+        self._doc_matrix = None
+        if participants:
+            self._build_doc_matrix(participants)
+
+    def _build_doc_matrix(self, participants: List[Dict[str, Any]]):
+        """
+        Assemble the stored participant embeddings into one matrix.
+
+        pgvector columns arrive as "[...]" strings over PostgREST; each
+        is decoded, L2-normalized, and stacked into an (N, dim) float32
+        matrix so a query is a single matrix-vector product instead of
+        a database round-trip. Rows without an embedding stay zero and
+        can never score above the similarity threshold.
+        """
+        vectors = []
+        for p in participants:
+            emb = p.get('embedding')
+            if isinstance(emb, str):
+                emb = orjson.loads(emb)
+            vectors.append(emb)
+
+        dim = next((len(v) for v in vectors if v), 0)
+        if not dim:
+            logger.warning("No stored embeddings found; SBERT will use the RPC path")
+            return
+
+        matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+        for i, v in enumerate(vectors):
+            if v:
+                row = np.asarray(v, dtype=np.float32)
+                norm = np.linalg.norm(row)
+                if norm > 0:
+                    matrix[i] = row / norm
+        self._doc_matrix = matrix
+        self._doc_ids = [p['id'] for p in participants]
+        logger.info(f"SBERT document matrix built for {len(vectors)} participants")
         
     def _load_model(self):
         """
-        Load Sentence-BERT model.
+        Load Sentence-BERT model via the shared process-wide singleton.
         """
-        logger.info(f"Loading SBERT model: {self.model_name}...")
         try:
-            self.model = SentenceTransformer(self.model_name)
-            logger.info("✅ SBERT model loaded successfully")
+            self.model = get_embedder()
         except Exception as e:
             logger.error(f"Failed to load SBERT model: {e}")
             raise
@@ -48,14 +187,32 @@ class SBERTRetriever(BaseRetriever):
         Returns:
             384-dimensional embedding vector
         """
+        return self.generate_embeddings([text])[0]
+
+    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for many texts in one batched forward pass.
+
+        Batching amortizes the Python/PyTorch dispatch overhead that a
+        per-text encode loop pays on every call; bulk jobs (seeding,
+        re-embedding) should prefer this over generate_embedding.
+
+        Args:
+            texts: Input texts
+
+        Returns:
+            One 384-dimensional embedding vector per input text
+        """
         if not self.model:
             raise RuntimeError("SBERT model not loaded")
             
-        # Generate embedding (returns numpy array)
-        embedding = self.model.encode(text)
-        
-        # Convert to list for JSON serialization
-        return embedding.tolist()
+        embeddings = self.model.encode(
+            texts,
+            batch_size=32,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return [embedding.tolist() for embedding in embeddings]
     
     def search(
         self,
@@ -77,9 +234,17 @@ class SBERTRetriever(BaseRetriever):
         logger.debug(f"SBERT search query: '{query}'")
         
         try:
-            # 1. Generate query embedding
-            query_embedding = self.generate_embedding(query)
+            # 1. Generate query embedding (cached per query text)
+            query_embedding = self._embedding_cache.get(query)
+            if query_embedding is None:
+                query_embedding = self._batcher.encode(query)
+                self._embedding_cache.set(query, query_embedding)
             
+            # 2a. Local path: cosine scores via one matrix-vector
+            # product over the in-memory document matrix
+            if self._doc_matrix is not None:
+                return self._search_local(query_embedding, top_k, filters)
+
             # 2. Prepare filters
             filter_remote = filters.get("remote") if filters else None
             filter_tools = filters.get("tools") if filters else None
@@ -99,14 +264,14 @@ class SBERTRetriever(BaseRetriever):
             response = supabase.rpc("match_participants", params).execute()
             
             # 4. Format results
-            results = []
-            if response.data:
-                for i, item in enumerate(response.data):
-                    results.append({
-                        "participant_id": item["id"],
-                        "score": item["similarity"],
-                        "rank": i + 1
-                    })
+            results = [
+                {
+                    "participant_id": item["id"],
+                    "score": item["similarity"],
+                    "rank": i + 1
+                }
+                for i, item in enumerate(response.data or [])
+            ]
             
             logger.info(f"SBERT returned {len(results)} results")
             return results
@@ -115,6 +280,43 @@ class SBERTRetriever(BaseRetriever):
             logger.error(f"SBERT search failed: {e}")
             return []
     
+    def _search_local(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Score against the local document matrix with argpartition top-k."""
+        q = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm > 0:
+            q = q / norm
+
+        scores = self._doc_matrix @ q
+        if filters and self._filter_mask is not None:
+            scores[~self._filter_mask(filters)] = 0.0
+
+        n = scores.size
+        if top_k < n:
+            top_idx = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            top_idx = np.arange(n)
+        top_idx = top_idx[np.argsort(-scores[top_idx])]
+
+        results = []
+        for i in top_idx:
+            score = scores[i]
+            if score <= 0:
+                break  # matches the RPC's 0.0 similarity threshold
+            results.append({
+                "participant_id": self._doc_ids[i],
+                "score": float(score),
+                "rank": len(results) + 1
+            })
+
+        logger.info(f"SBERT returned {len(results)} results")
+        return results
+
     def get_name(self) -> str:
         """Return the name of this retriever."""
         return f"SBERT ({self.model_name})"
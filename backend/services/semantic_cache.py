@@ -0,0 +1,99 @@
+"""
+Semantic response cache for LLM calls.
+Returns a cached response when a new prompt is close enough in embedding
+space to one already answered, turning a Gemini round-trip into a local
+vector lookup.
+"""
+
+import logging
+import time
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from services.embedder import get_embedder
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Cosine-similarity cache keyed by prompt embeddings.
+
+    Entries are stored as L2-normalized SBERT vectors in a float32 matrix,
+    so a lookup is one matrix-vector product over the live entries. Entries
+    expire after ttl seconds; when the cache grows past maxsize, the oldest
+    entry is dropped. Not thread-safe — intended for use from a single
+    event loop, like the TTLCache in utils.
+    """
+
+    def __init__(self, threshold: float = 0.92, maxsize: int = 256, ttl: float = 3600.0):
+        """
+        Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity to count as a hit
+            maxsize: Maximum number of entries to keep
+            ttl: Entry lifetime in seconds
+        """
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._embeddings: Optional[np.ndarray] = None  # (n, dim) float32
+        self._entries: List[Tuple[float, Any]] = []  # (expires_at, value)
+
+    @staticmethod
+    def _embed(text: str) -> np.ndarray:
+        """Embed text with the shared SBERT model, L2-normalized."""
+        vector = get_embedder().encode(
+            text,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return vector.astype(np.float32)
+
+    def _evict_expired(self) -> None:
+        """Drop expired entries, compacting the embedding matrix."""
+        now = time.monotonic()
+        keep = [i for i, (expires_at, _) in enumerate(self._entries) if expires_at > now]
+        if len(keep) == len(self._entries):
+            return
+        self._entries = [self._entries[i] for i in keep]
+        self._embeddings = self._embeddings[keep] if keep else None
+
+    def lookup(self, text: str) -> Optional[Any]:
+        """
+        Return the cached value for the closest prompt, or None on a miss.
+
+        Args:
+            text: Prompt text to match against cached prompts
+        """
+        self._evict_expired()
+        if not self._entries:
+            return None
+
+        similarities = self._embeddings @ self._embed(text)
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.threshold:
+            logger.debug(f"Semantic cache hit (similarity: {similarities[best]:.3f})")
+            return self._entries[best][1]
+        return None
+
+    def put(self, text: str, value: Any) -> None:
+        """Store value under the embedding of text, evicting if full."""
+        vector = self._embed(text)[np.newaxis, :]
+        if self._embeddings is None:
+            self._embeddings = vector
+        else:
+            self._embeddings = np.vstack([self._embeddings, vector])
+        self._entries.append((time.monotonic() + self.ttl, value))
+
+        while len(self._entries) > self.maxsize:
+            self._entries.pop(0)
+            self._embeddings = self._embeddings[1:]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries = []
+        self._embeddings = None
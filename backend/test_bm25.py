@@ -32,9 +32,8 @@ def test_bm25_search(retriever, query, top_k=5):
         return
     
     for i, result in enumerate(results, 1):
-        # Get full participant data
-        participant_id = result['participant_id']
-        participant = next(p for p in retriever.participants if p['id'] == participant_id)
+        # Get full participant data (O(1) via the retriever's id index)
+        participant = retriever.participants_by_id[result['participant_id']]
         
         print(f"{i}. {participant['name']} - {participant['role']}")
         print(f"   Score: {result['score']:.2f}")
@@ -0,0 +1,37 @@
+"""Embedding serialization test - float32 vectors round-trip through orjson."""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+print("1. Importing modules...")
+import numpy as np
+import orjson
+
+print("2. Building a float32 embedding batch like generate_embeddings returns...")
+rng = np.random.default_rng(42)
+embeddings = rng.random((4, 384), dtype=np.float32)
+embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+batch = [
+    {"name": f"Participant {i}", "embedding": embeddings[i]}
+    for i in range(len(embeddings))
+]
+
+print("3. Serializing with OPT_SERIALIZE_NUMPY...")
+payload = orjson.dumps(batch, option=orjson.OPT_SERIALIZE_NUMPY)
+
+print("4. Checking the round-trip...")
+decoded = orjson.loads(payload)
+restored = np.asarray([row["embedding"] for row in decoded], dtype=np.float32)
+assert restored.shape == embeddings.shape
+assert np.allclose(restored, embeddings, atol=1e-6)
+print(f"   ✅ {embeddings.shape[0]} x {embeddings.shape[1]} float32 vectors survived")
+
+print("5. Confirming float16 is still unsupported (why we stay float32)...")
+try:
+    orjson.dumps(embeddings.astype(np.float16), option=orjson.OPT_SERIALIZE_NUMPY)
+except TypeError:
+    print("   ✅ float16 raises TypeError as expected")
+else:
+    print("   ℹ️ this orjson build serializes float16; the float32 cast could be revisited")
+
+print("\n✅ Embedding serialization is WORKING!")
@@ -0,0 +1,50 @@
+"""Outreach LLM test - verifies the AI branch runs instead of the template fallback."""
+import asyncio
+import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+print("1. Importing modules...")
+from services.researcher.outreach_service import OutreachService
+
+FAKE_SUBJECT = "Compensated UX research invitation"
+FAKE_BODY = "This body came from the stubbed LLM call, not the template."
+
+
+class _FakeResponse:
+    text = json.dumps({"subject": FAKE_SUBJECT, "body": FAKE_BODY})
+
+
+class _FakeModel:
+    async def generate_content_async(self, *args, **kwargs):
+        return _FakeResponse()
+
+
+print("2. Building service with a stubbed Gemini model...")
+service = OutreachService()
+service.model = _FakeModel()  # skip get_gemini_model
+service._email_context._disabled = True  # force the inline-prompt path
+
+print("3. Generating an email...")
+email = asyncio.run(service.generate_outreach_email(
+    participant_name="Jordan Chen",
+    participant_role="Product Manager",
+    participant_company="BuildTech",
+    participant_description=None,
+    researcher_name="Casey Patel",
+    researcher_company="Recruitr",
+))
+
+print("4. Checking the LLM branch was taken...")
+# A failure anywhere in the structured-generation path is swallowed by
+# generate_outreach_email and surfaces as the template fallback, so the
+# model-authored subject/body proves the AI branch actually ran.
+assert email["subject"] == FAKE_SUBJECT, f"fallback subject: {email['subject']}"
+assert FAKE_BODY in email["body"], f"fallback body: {email['body']}"
+assert "I came across your profile" not in email["body"]
+assert email["body"].startswith("Hi Jordan,"), email["body"]
+assert email["body"].rstrip().endswith("Casey Patel"), email["body"]
+print("   ✅ Subject and body came from the model; greeting/signature added")
+
+print("\n✅ Outreach LLM branch is WORKING!")
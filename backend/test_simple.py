@@ -22,7 +22,7 @@ print(f"   ✅ Search returned {len(results)} results")
 
 print("\n5. Results:")
 for r in results[:3]:
-    p = next(p for p in participants if p['id'] == r['participant_id'])
+    p = retriever.participants_by_id[r['participant_id']]
     print(f"   - {p['name']} ({p['role']}) - Score: {r['score']:.2f}")
 
 print("\n✅ BM25 is WORKING!")
@@ -0,0 +1,5 @@
+"""Shared utilities."""
+
+from .caching import TTLCache
+
+__all__ = ["TTLCache"]